@@ -4,7 +4,15 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from src.core.contexts.aws_s3 import AwsContext
+from src.core.contexts.cache import CacheContext
 from src.core.contexts.postgresql import PostgreSqlConnection
+from src.core.contexts.process_pool import ProcessPoolContext
+from src.core.listener import Listener
+from src.core.scheduler import Scheduler
+from src.modules.group.repository import GroupRepository
+from src.modules.tag.repository import TAGS_CHANNEL, TagRepository
+from src.modules.title.repository import TitleRepository
+from src.modules.title.service import TitleService
 from src.settings import Settings
 
 
@@ -13,11 +21,59 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan events."""
     # Before startup
     await PostgreSqlConnection.create_all()
+    await TitleRepository().rebuild_index()
+    await TitleRepository().reconcile_rating_summaries()
+    await TitleRepository().reconcile_tag_usage()
+    await TitleRepository().rebuild_ranking()
+    await TagRepository().get_snapshot()
 
+    Scheduler.add(
+        Settings.TITLE_INDEX_REFRESH_INTERVAL,
+        TitleRepository().refresh_index,
+    )
+    Scheduler.add(
+        Settings.RATING_RECONCILE_INTERVAL,
+        TitleRepository().reconcile_rating_summaries,
+    )
+    Scheduler.add(
+        Settings.TAG_USAGE_RECONCILE_INTERVAL,
+        TitleRepository().reconcile_tag_usage,
+    )
+    Scheduler.add(
+        Settings.TAG_USAGE_REFRESH_INTERVAL,
+        TagRepository().refresh_usage,
+    )
+    Scheduler.add(
+        Settings.GROUP_COUNTS_RECONCILE_INTERVAL,
+        GroupRepository().reconcile_group_counts,
+    )
+    Scheduler.add(
+        Settings.TITLE_RANKING_REFRESH_INTERVAL,
+        TitleRepository().refresh_ranking,
+    )
+    Scheduler.add(
+        Settings.TITLE_RANKING_REBUILD_INTERVAL,
+        TitleRepository().rebuild_ranking,
+    )
+    Scheduler.add(
+        Settings.COVER_GC_INTERVAL,
+        TitleService(TitleRepository(), TagRepository()).collect_cover_blobs,
+    )
+    Scheduler.start()
+
+    Listener.add(TAGS_CHANNEL, TagRepository().on_notify)
+    Listener.start()
+
+    await AwsContext.open_clients()
     if Settings.ENV == "dev":
         await AwsContext.create_bucket()
 
     yield
 
     # Before shutdown
+    await Scheduler.stop()
+    await Listener.stop()
+    await CacheContext.close_cache()
+    ProcessPoolContext.close_pool()
+    await AwsContext.close_clients()
     await PostgreSqlConnection.close_engine()
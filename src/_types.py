@@ -4,3 +4,8 @@ from enum import StrEnum
 class LanguageEnum(StrEnum):
     ENGLISH = "en"
     PORTUGUESE = "pt"
+
+
+class SortOrderEnum(StrEnum):
+    ASC = "ASC"
+    DESC = "DESC"
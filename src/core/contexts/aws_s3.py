@@ -1,17 +1,38 @@
-from typing import Any
+import asyncio
+import time
+from collections.abc import AsyncIterator, Iterable
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, ClassVar
 
 import aioboto3
+from aiobotocore.config import AioConfig
+from pydantic import BaseModel
 
 from src.settings import Settings
 
 
+class S3ClientStats(BaseModel):
+    """S3 clients and connection pools statistics model."""
+
+    clients: int
+    borrowed: int
+    max_connections: int
+    in_use_connections: int
+    idle_connections: int
+
+
 class AwsContext:
     """AWS context.
 
-    Asynchronously create and get the AWS session.
+    Asynchronously create and get the AWS session, and the long-lived S3
+    clients shared by every request.
     """
 
     _session: aioboto3.Session | None = None
+    _clients: ClassVar[list[Any]] = []
+    _borrowed: ClassVar[list[int]] = []
+    _exit_stack: AsyncExitStack | None = None
+    _lock = asyncio.Lock()
 
     @staticmethod
     def get_session() -> aioboto3.Session:
@@ -37,14 +58,127 @@ class AwsContext:
         )
         return AwsContext._session
 
+    @staticmethod
+    async def open_clients() -> None:
+        """Create the long-lived S3 clients and their connection pools.
+
+        Presigned URLs are signed with SigV4, which is required for presigned
+        uploads to enforce their content type and length.
+        """
+        if AwsContext._exit_stack is not None:
+            return
+
+        config = AioConfig(
+            signature_version="s3v4",
+            max_pool_connections=Settings.AWS_MAX_POOL_CONNECTIONS,
+            tcp_keepalive=True,
+            connector_args={"keepalive_timeout": Settings.AWS_KEEPALIVE_TIMEOUT},
+        )
+        session = AwsContext.get_session()
+        async with AsyncExitStack() as stack:
+            clients = [
+                await stack.enter_async_context(
+                    session.client("s3", config=config),  # type: ignore[call-overload]
+                )
+                for _ in range(max(Settings.AWS_CLIENTS, 1))
+            ]
+            AwsContext._exit_stack = stack.pop_all()
+
+        AwsContext._clients = clients
+        AwsContext._borrowed = [0] * len(clients)
+
+    @staticmethod
+    async def close_clients() -> None:
+        """Close the S3 clients."""
+        if AwsContext._exit_stack is not None:
+            await AwsContext._exit_stack.aclose()
+            AwsContext._exit_stack = None
+            AwsContext._clients = []
+            AwsContext._borrowed = []
+
+    @staticmethod
+    @asynccontextmanager
+    async def s3_client() -> AsyncIterator[Any]:
+        """Borrow the least busy S3 client, opening the clients if needed."""
+        if AwsContext._exit_stack is None:
+            async with AwsContext._lock:
+                await AwsContext.open_clients()
+
+        index = min(
+            range(len(AwsContext._clients)),
+            key=AwsContext._borrowed.__getitem__,
+        )
+        AwsContext._borrowed[index] += 1
+        try:
+            yield AwsContext._clients[index]
+        finally:
+            AwsContext._borrowed[index] -= 1
+
+    @staticmethod
+    def stats() -> S3ClientStats:
+        """Get the S3 clients and connection pools statistics."""
+        in_use = idle = 0
+        for client in AwsContext._clients:
+            endpoint = getattr(client, "_endpoint", None)
+            http_session = getattr(endpoint, "http_session", None)
+            for session in getattr(http_session, "_sessions", {}).values():
+                connector = session.connector
+                in_use += len(connector._acquired)  # noqa: SLF001
+                idle += sum(len(conns) for conns in connector._conns.values())  # noqa: SLF001
+
+        return S3ClientStats(
+            clients=len(AwsContext._clients),
+            borrowed=sum(AwsContext._borrowed),
+            max_connections=len(AwsContext._clients)
+            * Settings.AWS_MAX_POOL_CONNECTIONS,
+            in_use_connections=in_use,
+            idle_connections=idle,
+        )
+
+    @staticmethod
+    async def get_object_urls(keys: Iterable[str]) -> dict[str, str]:
+        """Get the download URLs of objects of the bucket.
+
+        URLs point to `Settings.AWS_PUBLIC_URL` (a CDN or a public bucket) when
+        it is set, and are presigned GET URLs otherwise.
+        """
+        keys = set(keys)
+        if Settings.AWS_PUBLIC_URL:
+            base_url = Settings.AWS_PUBLIC_URL.rstrip("/")
+            return {key: f"{base_url}/{key}" for key in keys}
+
+        if not keys:
+            return {}
+
+        async with AwsContext.s3_client() as s3:
+            return {
+                key: await s3.generate_presigned_url(
+                    "get_object",
+                    Params={"Bucket": Settings.AWS_BUCKET_NAME, "Key": key},
+                    ExpiresIn=Settings.AWS_URL_EXPIRES,
+                )
+                for key in keys
+            }
+
+    @staticmethod
+    def get_url_epoch() -> str:
+        """Get the current period of the download URLs.
+
+        Presigned URLs change every half of their lifetime, so responses
+        embedding them can be revalidated before they expire. CDN URLs never
+        change.
+        """
+        if Settings.AWS_PUBLIC_URL:
+            return ""
+        return str(int(time.time()) // max(Settings.AWS_URL_EXPIRES // 2, 1))
+
     @staticmethod
     async def create_bucket(name: str = Settings.AWS_BUCKET_NAME) -> None:
         """Create a bucket."""
-        session = AwsContext.get_session()
-        async with session.client("s3") as s3:  # type: ignore[arg-type]
-            response: dict[str, Any] = await s3.list_buckets()  # type: ignore[arg-type]
-            if name not in [bucket["Name"] for bucket in response["Buckets"]]:  # type: ignore[index]
-                await s3.create_bucket(  # type: ignore[arg-type]
+        async with AwsContext.s3_client() as s3:
+            response: dict[str, Any] = await s3.list_buckets()
+            if name not in [bucket["Name"] for bucket in response["Buckets"]]:
+                await s3.create_bucket(
                     ACL="public-read-write",
                     Bucket=name,
                     CreateBucketConfiguration={
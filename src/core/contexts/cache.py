@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+from src.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Key-value cache backend storing bytes with a TTL."""
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Get a value, or `None` if it is missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        """Set a value that expires after `ttl` seconds."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Delete values."""
+
+    async def close(self) -> None:  # noqa: B027
+        """Release the backend resources."""
+
+
+class MemoryCache(CacheBackend):
+    """In-process cache with TTL and LRU eviction."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+class RedisError(Exception):
+    """Error returned by a Redis-protocol server."""
+
+
+class RedisCache(CacheBackend):
+    """Cache speaking the Redis protocol (RESP) over a single connection.
+
+    Eviction is left to the server `maxmemory-policy`. Connection errors are
+    logged and treated as cache misses, so the cache never fails a request.
+    """
+
+    def __init__(self, url: str) -> None:
+        parsed = urlsplit(url)
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port or 6379
+        self._password = unquote(parsed.password) if parsed.password else None
+        self._db = int(parsed.path.lstrip("/") or 0)
+        self._lock = asyncio.Lock()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def get(self, key: str) -> bytes | None:
+        response = await self._safe_command("GET", key)
+        return response if isinstance(response, bytes) else None
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self._safe_command("SET", key, value, "EX", ttl)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._safe_command("DEL", *keys)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def _safe_command(self, *args: str | bytes | int) -> Any:  # noqa: ANN401
+        try:
+            return await self._command(*args)
+        except (OSError, asyncio.IncompleteReadError, RedisError):
+            logger.exception("Cache command %s failed", args[0])
+            return None
+
+    async def _command(self, *args: str | bytes | int) -> Any:  # noqa: ANN401
+        """Send a command and read its reply.
+
+        Any failure between the two, including a cancellation, leaves the
+        connection out of sync with its replies, so it is dropped.
+        """
+        async with self._lock:
+            try:
+                if self._reader is None or self._writer is None:
+                    self._reader, self._writer = await asyncio.open_connection(
+                        self._host,
+                        self._port,
+                    )
+                    if self._password:
+                        await self._send(
+                            self._reader,
+                            self._writer,
+                            "AUTH",
+                            self._password,
+                        )
+                    if self._db:
+                        await self._send(self._reader, self._writer, "SELECT", self._db)
+
+                return await self._send(self._reader, self._writer, *args)
+            except BaseException:
+                await self.close()
+                raise
+
+    async def _send(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        *args: str | bytes | int,
+    ) -> Any:  # noqa: ANN401
+        parts = [arg if isinstance(arg, bytes) else str(arg).encode() for arg in args]
+        writer.write(
+            b"*%d\r\n" % len(parts)
+            + b"".join(b"$%d\r\n%b\r\n" % (len(part), part) for part in parts),
+        )
+        await writer.drain()
+        return await self._read(reader)
+
+    async def _read(self, reader: asyncio.StreamReader) -> Any:  # noqa: ANN401
+        line = (await reader.readuntil(b"\r\n"))[:-2]
+        prefix, payload = line[:1], line[1:]
+
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise RedisError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            size = int(payload)
+            if size < 0:
+                return None
+            return (await reader.readexactly(size + 2))[:-2]
+        if prefix == b"*":
+            size = int(payload)
+            if size < 0:
+                return None
+            return [await self._read(reader) for _ in range(size)]
+
+        err_msg = f"Unexpected cache response: {line!r}"
+        raise RedisError(err_msg)
+
+
+class CacheContext:
+    """Cache context.
+
+    Create and get the cache backend selected by `Settings.CACHE_BACKEND`.
+    """
+
+    _cache: CacheBackend | None = None
+
+    @staticmethod
+    def get_cache() -> CacheBackend:
+        """Get the cache."""
+        if CacheContext._cache is None:
+            return CacheContext.create_cache()
+        return CacheContext._cache
+
+    @staticmethod
+    def create_cache() -> CacheBackend:
+        """Create the cache."""
+        if CacheContext._cache is not None:
+            err_msg = (
+                "Cache is already set. Use `CacheContext.get_cache()` to get the cache."
+            )
+            raise ValueError(err_msg)
+
+        if Settings.CACHE_BACKEND == "redis":
+            CacheContext._cache = RedisCache(Settings.CACHE_URL)
+        else:
+            CacheContext._cache = MemoryCache(Settings.CACHE_MAX_ENTRIES)
+        return CacheContext._cache
+
+    @staticmethod
+    async def close_cache() -> None:
+        """Close the cache."""
+        if CacheContext._cache is not None:
+            await CacheContext._cache.close()
+            CacheContext._cache = None
@@ -1,3 +1,4 @@
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.ext.asyncio.session import AsyncSession, async_sessionmaker
 
@@ -51,6 +52,7 @@ class PostgreSqlConnection:
         engine = PostgreSqlConnection.get_engine()
 
         async with engine.begin() as async_conn:
+            await async_conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
             await async_conn.run_sync(BaseTable.metadata.create_all)
 
     @staticmethod
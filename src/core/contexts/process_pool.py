@@ -0,0 +1,54 @@
+import asyncio
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, TypeVar
+
+from src.settings import Settings
+
+_R = TypeVar("_R")
+
+
+class ProcessPoolContext:
+    """Process pool context.
+
+    Create and get the process pool running CPU-bound work off the event loop.
+    """
+
+    _pool: ProcessPoolExecutor | None = None
+
+    @staticmethod
+    def get_pool() -> ProcessPoolExecutor:
+        """Get the pool."""
+        if ProcessPoolContext._pool is None:
+            return ProcessPoolContext.create_pool()
+        return ProcessPoolContext._pool
+
+    @staticmethod
+    def create_pool() -> ProcessPoolExecutor:
+        """Create the pool."""
+        if ProcessPoolContext._pool is not None:
+            err_msg = (
+                "Pool is already set. "
+                "Use `ProcessPoolContext.get_pool()` to get the pool."
+            )
+            raise ValueError(err_msg)
+
+        ProcessPoolContext._pool = ProcessPoolExecutor(
+            max_workers=Settings.PROCESS_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        return ProcessPoolContext._pool
+
+    @staticmethod
+    def close_pool() -> None:
+        """Close the pool, waiting for the running work."""
+        if ProcessPoolContext._pool is not None:
+            ProcessPoolContext._pool.shutdown(cancel_futures=True)
+            ProcessPoolContext._pool = None
+
+    @staticmethod
+    async def run(func: Callable[..., _R], *args: Any) -> _R:  # noqa: ANN401
+        """Run a picklable function in the pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(ProcessPoolContext.get_pool(), func, *args)
@@ -0,0 +1,82 @@
+import hashlib
+from collections.abc import Awaitable, Callable
+from typing import Annotated, Any
+
+from fastapi import Depends, HTTPException, Request, Response, params, status
+
+from src.settings import Settings
+
+
+class ETagValidator:
+    """Conditional GET support for a route.
+
+    `version` is a FastAPI dependency returning the version of the resource,
+    usually its `updated_at` (or the max `updated_at` of a list), or `None` to
+    skip validation. The ETag is derived from that version and the request URL,
+    so a matching `If-None-Match` is answered with `304 Not Modified` before
+    the endpoint builds its response.
+    """
+
+    def __init__(
+        self,
+        version: Callable[..., Awaitable[str | None]],
+        *,
+        weak: bool = True,
+        cache_control: str | None = None,
+    ) -> None:
+        self.version = version
+        self.weak = weak
+        self.cache_control = cache_control or (
+            f"public, max-age=0, s-maxage={Settings.HTTP_CACHE_MAX_AGE}, "
+            "must-revalidate"
+        )
+
+    def etag(self, request: Request, version: str) -> str:
+        """Build the ETag of a resource version at the requested URL."""
+        digest = hashlib.sha256(
+            f"{request.url.path}?{request.url.query}#{version}".encode(),
+        ).hexdigest()[:32]
+        return f'W/"{digest}"' if self.weak else f'"{digest}"'
+
+    def validate(self, request: Request, response: Response, version: str) -> None:
+        """Set the caching headers, or raise a `304` if the client is up to date."""
+        etag = self.etag(request, version)
+        headers = {"ETag": etag, "Cache-Control": self.cache_control}
+
+        if self._matches(request.headers.get("If-None-Match"), etag):
+            raise HTTPException(status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
+
+    def dependency(self) -> params.Depends:
+        """Get the route dependency that validates conditional requests."""
+
+        async def validate_etag(
+            request: Request,
+            response: Response,
+            version: Annotated[str | None, Depends(self.version)],
+        ) -> None:
+            if version is not None:
+                self.validate(request, response, version)
+
+        return Depends(validate_etag)
+
+    def responses(self) -> dict[int | str, dict[str, Any]]:
+        """OpenAPI responses added to the route."""
+        return {status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}}
+
+    @staticmethod
+    def _matches(if_none_match: str | None, etag: str) -> bool:
+        """Weak comparison of an `If-None-Match` header against an ETag."""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        return any(
+            _opaque(candidate) == _opaque(etag)
+            for candidate in if_none_match.split(",")
+        )
+
+
+def _opaque(etag: str) -> str:
+    return etag.strip().removeprefix("W/")
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import ClassVar
+
+import psycopg
+from sqlalchemy.engine import make_url
+
+from src.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+_RECONNECT_DELAY = 5
+
+
+class Listener:
+    """PostgreSQL `LISTEN` for notifications sent by any worker.
+
+    Callbacks are registered per channel before startup and receive the
+    payload of every `NOTIFY` on their channel. They receive `None` whenever
+    the listener (re)connects, as notifications sent while disconnected are
+    lost.
+    """
+
+    _callbacks: ClassVar[dict[str, list[Callable[[str | None], None]]]] = {}
+    _task: ClassVar[asyncio.Task[None] | None] = None
+
+    @staticmethod
+    def add(channel: str, callback: Callable[[str | None], None]) -> None:
+        """Register a callback for a channel."""
+        Listener._callbacks.setdefault(channel, []).append(callback)
+
+    @staticmethod
+    def start() -> None:
+        """Start listening to the registered channels."""
+        if Listener._callbacks and Listener._task is None:
+            Listener._task = asyncio.create_task(Listener._run())
+
+    @staticmethod
+    async def stop() -> None:
+        """Stop listening and forget the registered callbacks."""
+        if Listener._task is not None:
+            Listener._task.cancel()
+            await asyncio.gather(Listener._task, return_exceptions=True)
+            Listener._task = None
+        Listener._callbacks.clear()
+
+    @staticmethod
+    async def _run() -> None:
+        url = make_url(Settings.DB_URL).set(drivername="postgresql")
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    url.render_as_string(hide_password=False),
+                    autocommit=True,
+                ) as connection:
+                    for channel in Listener._callbacks:
+                        await connection.execute(f'LISTEN "{channel}"')
+                    Listener._dispatch(None, None)
+
+                    async for notify in connection.notifies():
+                        Listener._dispatch(notify.channel, notify.payload)
+            except psycopg.Error:
+                logger.exception("Notification listener disconnected")
+                await asyncio.sleep(_RECONNECT_DELAY)
+
+    @staticmethod
+    def _dispatch(channel: str | None, payload: str | None) -> None:
+        """Call the callbacks of a channel, or of every channel if `None`."""
+        for name, callbacks in Listener._callbacks.items():
+            if channel in (None, name):
+                for callback in callbacks:
+                    callback(payload)
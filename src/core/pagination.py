@@ -0,0 +1,49 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from src.exceptions.bad_request import InvalidCursorError
+
+
+def _json_default(value: Any) -> str:  # noqa: ANN401
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class Cursor:
+    """Opaque keyset cursor helper.
+
+    A cursor is the url-safe base64 of a JSON array holding the sort key name
+    followed by the values of the last row of the previous page.
+    """
+
+    @staticmethod
+    def encode(key: str, *values: Any) -> str:  # noqa: ANN401
+        """Encode a cursor for the given sort key and row values."""
+        payload = json.dumps(
+            [key, *values],
+            default=_json_default,
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str, key: str, size: int) -> list[Any]:
+        """Decode a cursor, checking that it was built for the given sort key."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise InvalidCursorError(cursor=cursor) from None
+
+        if (
+            not isinstance(payload, list)
+            or len(payload) != size + 1
+            or payload[0] != key
+        ):
+            raise InvalidCursorError(cursor=cursor)
+
+        return payload[1:]
@@ -11,6 +11,7 @@ from fastapi.types import DecoratedCallable
 from fastapi.utils import generate_unique_id
 from starlette.routing import BaseRoute
 
+from src.core.etag import ETagValidator
 from src.exceptions.base import ApiError
 from src.exceptions.unauthorized import InvalidTokenError, MissingTokenError
 from src.security.auth import AuthSecurity
@@ -191,6 +192,7 @@ class ApiRouter(APIRouter):
         generate_unique_id_function: Callable[[APIRoute], str] = generate_unique_id,
         requires_login: bool = False,
         exceptions: Sequence[ApiError] | None = None,
+        etag: ETagValidator | None = None,
     ) -> Callable[[DecoratedCallable], DecoratedCallable]:
         dependencies, responses = self.handle_requires_login(
             requires_login=requires_login,
@@ -198,6 +200,10 @@ class ApiRouter(APIRouter):
             responses=responses,
         )
 
+        if etag:
+            dependencies = [*(dependencies or []), etag.dependency()]
+            responses = {**etag.responses(), **(responses or {})}
+
         if exceptions:
             responses = self.handle_exceptions(
                 *exceptions,
@@ -0,0 +1,48 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, ClassVar
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """Periodic background jobs.
+
+    Jobs are registered before startup and run every `interval` seconds while
+    the application is alive. A failing run is logged and retried on the next
+    tick.
+    """
+
+    _jobs: ClassVar[list[tuple[float, Callable[[], Awaitable[Any]]]]] = []
+    _tasks: ClassVar[set[asyncio.Task[None]]] = set()
+
+    @staticmethod
+    def add(interval: float, job: Callable[[], Awaitable[Any]]) -> None:
+        """Register a job. Jobs with a non-positive interval are disabled."""
+        if interval > 0:
+            Scheduler._jobs.append((interval, job))
+
+    @staticmethod
+    def start() -> None:
+        """Start every registered job."""
+        for interval, job in Scheduler._jobs:
+            Scheduler._tasks.add(asyncio.create_task(Scheduler._run(interval, job)))
+
+    @staticmethod
+    async def stop() -> None:
+        """Cancel the running jobs and forget the registered ones."""
+        for task in Scheduler._tasks:
+            task.cancel()
+        await asyncio.gather(*Scheduler._tasks, return_exceptions=True)
+        Scheduler._tasks.clear()
+        Scheduler._jobs.clear()
+
+    @staticmethod
+    async def _run(interval: float, job: Callable[[], Awaitable[Any]]) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await job()
+            except Exception:
+                logger.exception("Scheduled job %s failed", job.__qualname__)
@@ -0,0 +1,194 @@
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import TYPE_CHECKING, Any
+
+from src.settings import Settings
+
+if TYPE_CHECKING:
+    from fastapi import UploadFile
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def iter_file(
+    file: "UploadFile",
+    chunk_size: int = CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """Read an uploaded file in chunks."""
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+async def read_head(
+    chunks: AsyncIterable[bytes],
+    size: int,
+) -> tuple[bytes, AsyncIterator[bytes]]:
+    """Read at least `size` bytes of a stream, unless it ends first.
+
+    Returns the bytes read and an iterator over the whole stream, head included.
+    """
+    iterator = aiter(chunks)
+    head = bytearray()
+    async for chunk in iterator:
+        head += chunk
+        if len(head) >= size:
+            break
+
+    async def stream() -> AsyncIterator[bytes]:
+        if head:
+            yield bytes(head)
+        async for chunk in iterator:
+            yield chunk
+
+    return bytes(head[:size]), stream()
+
+
+async def limit_size(
+    chunks: AsyncIterable[bytes],
+    max_size: int,
+    exception: Exception,
+) -> AsyncIterator[bytes]:
+    """Pass a stream through, raising `exception` once it exceeds `max_size`."""
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > max_size:
+            raise exception
+        yield chunk
+
+
+class MultipartUpload:
+    """Streaming upload of a single S3 object.
+
+    Chunks are buffered into parts of `part_size` bytes, which are uploaded
+    while the next ones are read, at most `concurrency` at a time. Memory use
+    is bounded by about `part_size * (concurrency + 1)` whatever the object
+    size, and nothing touches the local disk. Objects smaller than one part
+    are sent with a single `PutObject`. The multipart upload is aborted if
+    the stream or any part fails. `extra_args`, such as `CacheControl`, are
+    passed to the request creating the object.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        s3: Any,  # noqa: ANN401
+        bucket: str,
+        key: str,
+        *,
+        content_type: str,
+        part_size: int = Settings.S3_PART_SIZE,
+        concurrency: int = Settings.S3_UPLOAD_CONCURRENCY,
+        extra_args: dict[str, Any] | None = None,
+    ) -> None:
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.content_type = content_type
+        self.part_size = part_size
+        self.concurrency = concurrency
+        self.extra_args = extra_args or {}
+
+    async def upload(self, chunks: AsyncIterable[bytes]) -> int:
+        """Upload a stream, returning its size in bytes."""
+        buffer = bytearray()
+        size = 0
+        upload_id: str | None = None
+        parts: list[asyncio.Task[dict[str, Any]]] = []
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                buffer += chunk
+                while len(buffer) >= self.part_size:
+                    if upload_id is None:
+                        upload_id = await self._create()
+                    parts.append(
+                        await self._start_part(
+                            upload_id,
+                            len(parts) + 1,
+                            bytes(buffer[: self.part_size]),
+                            semaphore,
+                            parts,
+                        ),
+                    )
+                    del buffer[: self.part_size]
+
+            if upload_id is None:
+                await self.s3.put_object(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    Body=bytes(buffer),
+                    ContentType=self.content_type,
+                    **self.extra_args,
+                )
+                return size
+
+            if buffer:
+                parts.append(
+                    await self._start_part(
+                        upload_id,
+                        len(parts) + 1,
+                        bytes(buffer),
+                        semaphore,
+                        parts,
+                    ),
+                )
+            await self.s3.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": list(await asyncio.gather(*parts))},
+            )
+        except BaseException:
+            for part in parts:
+                part.cancel()
+            await asyncio.gather(*parts, return_exceptions=True)
+            if upload_id is not None:
+                await self.s3.abort_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=upload_id,
+                )
+            raise
+
+        return size
+
+    async def _create(self) -> str:
+        response = await self.s3.create_multipart_upload(
+            Bucket=self.bucket,
+            Key=self.key,
+            ContentType=self.content_type,
+            **self.extra_args,
+        )
+        return str(response["UploadId"])
+
+    async def _start_part(
+        self,
+        upload_id: str,
+        number: int,
+        body: bytes,
+        semaphore: asyncio.Semaphore,
+        parts: list[asyncio.Task[dict[str, Any]]],
+    ) -> asyncio.Task[dict[str, Any]]:
+        """Wait for a free upload slot, then start uploading a part."""
+        await semaphore.acquire()
+        for part in parts:
+            if part.done() and part.exception():
+                semaphore.release()
+                await part
+
+        async def upload_part() -> dict[str, Any]:
+            try:
+                response = await self.s3.upload_part(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    Body=body,
+                )
+                return {"ETag": response["ETag"], "PartNumber": number}
+            finally:
+                semaphore.release()
+
+        return asyncio.create_task(upload_part())
@@ -64,3 +64,30 @@ class InvalidMimeTypeError(BadRequestError):
         **metadata: str | float | dict[str, Any] | list[Any],
     ) -> None:
         super().__init__(message=message, **metadata)
+
+
+class InvalidCursorError(BadRequestError):
+    def __init__(
+        self,
+        message: str = "Invalid cursor",
+        **metadata: str | float | dict[str, Any] | list[Any],
+    ) -> None:
+        super().__init__(message=message, **metadata)
+
+
+class InvalidCoverUploadError(BadRequestError):
+    def __init__(
+        self,
+        message: str = "Invalid cover upload",
+        **metadata: str | float | dict[str, Any] | list[Any],
+    ) -> None:
+        super().__init__(message=message, **metadata)
+
+
+class InvalidTagMergeError(BadRequestError):
+    def __init__(
+        self,
+        message: str = "Invalid tag merge",
+        **metadata: str | float | dict[str, Any] | list[Any],
+    ) -> None:
+        super().__init__(message=message, **metadata)
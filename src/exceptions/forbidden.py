@@ -0,0 +1,27 @@
+from typing import Any
+
+from fastapi import status
+
+from src.exceptions.base import ApiError
+
+
+class ForbiddenError(ApiError):
+    """Forbidden exception."""
+
+    def __init__(
+        self,
+        message: str = "Forbidden",
+        **metadata: str | float | dict[str, Any] | list[Any],
+    ) -> None:
+        super().__init__(message, status_code=status.HTTP_403_FORBIDDEN, **metadata)
+
+
+class NotGroupOwnerError(ForbiddenError):
+    """Not the group owner exception."""
+
+    def __init__(
+        self,
+        message: str = "Only the group owner can do this",
+        **metadata: str | float | dict[str, Any] | list[Any],
+    ) -> None:
+        super().__init__(message=message, **metadata)
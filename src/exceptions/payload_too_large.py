@@ -0,0 +1,21 @@
+from typing import Any
+
+from src.exceptions.base import ApiError
+
+
+class PayloadTooLargeError(ApiError):
+    def __init__(
+        self,
+        message: str = "Payload too large",
+        **metadata: str | float | dict[str, Any] | list[Any],
+    ) -> None:
+        super().__init__(message, 413, **metadata)
+
+
+class FileTooLargeError(PayloadTooLargeError):
+    def __init__(
+        self,
+        message: str = "File too large",
+        **metadata: str | float | dict[str, Any] | list[Any],
+    ) -> None:
+        super().__init__(message=message, **metadata)
@@ -5,6 +5,9 @@ err-InvalidUsernameError =  Invalid username
 err-PasswordsDoNotMatchError = Passwords does not match
 err-MissingParamsError = Missing parameters
 err-InvalidMimeTypeError = Invalid mime type
+err-InvalidCursorError = Invalid cursor
+err-InvalidCoverUploadError = Invalid cover upload
+err-InvalidTagMergeError = Invalid tag merge
 
 err-ConflictError = Conflict
 err-UsernameAlreadyExistsError = Username already exists
@@ -21,3 +24,9 @@ err-UnauthorizedError = Unauthorized
 err-MissingTokenError = Missing token
 err-InvalidTokenError = Invalid token
 err-EmailOrPasswordError = Email or password is incorrect
+
+err-ForbiddenError = Forbidden
+err-NotGroupOwnerError = Only the group owner can do this
+
+err-PayloadTooLargeError = Payload too large
+err-FileTooLargeError = File too large
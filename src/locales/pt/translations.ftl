@@ -5,6 +5,9 @@ err-InvalidUsernameError = Nome de usuário inválido
 err-PasswordsDoNotMatchError = As senhas não coincidem
 err-MissingParamsError = Parâmetros ausentes
 err-InvalidMimeTypeError = Tipo MIME inválido
+err-InvalidCursorError = Cursor inválido
+err-InvalidCoverUploadError = Upload de capa inválido
+err-InvalidTagMergeError = Mesclagem de tags inválida
 
 err-ConflictError = Conflito
 err-UsernameAlreadyExistsError = Nome de usuário já existe
@@ -20,4 +23,10 @@ err-GroupNotFoundError = Grupo não encontrado
 err-UnauthorizedError = Não autorizado
 err-MissingTokenError = Token ausente
 err-InvalidTokenError = Token inválido
-err-EmailOrPasswordError = Email ou senha incorretos
\ No newline at end of file
+err-EmailOrPasswordError = Email ou senha incorretos
+
+err-ForbiddenError = Proibido
+err-NotGroupOwnerError = Apenas o dono do grupo pode fazer isso
+
+err-PayloadTooLargeError = Conteúdo muito grande
+err-FileTooLargeError = Arquivo muito grande
@@ -1,6 +1,7 @@
-from typing import Literal
+from collections.abc import Sequence
+from typing import Annotated, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Rating(BaseModel):
@@ -18,7 +19,26 @@ class CreateRating(BaseModel):
     value: Literal[1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
 
 
+class PostedRating(CreateRating):
+    """Posted rating model, telling whether the rating was created or changed."""
+
+    created: bool
+
+
 class PostRating(BaseModel):
     """Create rating model."""
 
     value: Literal[1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+
+class GetRatings(BaseModel):
+    """Get ratings of many targets model."""
+
+    ids: Annotated[Sequence[int], Field(min_length=1, max_length=100)]
+
+
+class TargetRating(Rating):
+    """Rating of a target, with the rating of the calling user if logged in."""
+
+    target_id: int
+    user_rating: int | None = None
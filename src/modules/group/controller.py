@@ -3,15 +3,25 @@ from typing import Annotated
 
 from fastapi import Body, Query, Request
 
+from src.core.etag import ETagValidator
 from src.core.router import ApiRouter
-from src.modules.group.dtos import CreateGroup, GetGroups, Group
+from src.exceptions.bad_request import InvalidCursorError
+from src.exceptions.forbidden import NotGroupOwnerError
+from src.exceptions.not_found import GroupNotFoundError, UserNotFoundError
+from src.modules.group.dtos import (
+    CreateGroup,
+    GetGroups,
+    GetGroupUsers,
+    Group,
+    GroupUserPage,
+)
 from src.modules.group.repository import GroupRepository
 from src.modules.group.service import GroupService
-from src.modules.user.dtos import User
+from src.modules.user.repository import UserRepository
 
 router = ApiRouter(prefix="/group", tags=["group"])
 
-SERVICE = GroupService(GroupRepository())
+SERVICE = GroupService(GroupRepository(), UserRepository())
 
 
 @router.get("", response_model=Sequence[Group])
@@ -27,12 +37,59 @@ async def create_group(
     return await SERVICE.create_group(user_id=request.state.user.id, params=params)
 
 
-@router.get("/{group_id}/members", response_model=Sequence[User])
-async def get_group_members(group_id: int) -> Sequence["User"]:
-    return await SERVICE.get_group_members(group_id)
-
-
-@router.get("/{group_id}", response_model=Group)
+@router.get(
+    "/{group_id}/members",
+    response_model=GroupUserPage,
+    exceptions=[InvalidCursorError(cursor="abc")],
+)
+async def get_group_members(
+    group_id: int,
+    params: Annotated[GetGroupUsers, Query()],
+) -> GroupUserPage:
+    return await SERVICE.get_group_members(group_id, params)
+
+
+@router.get(
+    "/{group_id}/followers",
+    response_model=GroupUserPage,
+    exceptions=[InvalidCursorError(cursor="abc")],
+)
+async def get_group_followers(
+    group_id: int,
+    params: Annotated[GetGroupUsers, Query()],
+) -> GroupUserPage:
+    return await SERVICE.get_group_followers(group_id, params)
+
+
+@router.post(
+    "/{group_id}/members/{user_id}",
+    exceptions=[GroupNotFoundError(), NotGroupOwnerError(), UserNotFoundError()],
+    requires_login=True,
+    status_code=201,
+)
+async def add_group_member(group_id: int, user_id: int, request: Request) -> None:
+    return await SERVICE.add_group_member(group_id, request.state.user.id, user_id)
+
+
+@router.delete(
+    "/{group_id}/members/{user_id}",
+    exceptions=[GroupNotFoundError(), NotGroupOwnerError()],
+    requires_login=True,
+    status_code=204,
+)
+async def remove_group_member(group_id: int, user_id: int, request: Request) -> None:
+    return await SERVICE.remove_group_member(group_id, request.state.user.id, user_id)
+
+
+async def _group_version(group_id: int) -> str | None:
+    return await SERVICE.get_group_version(group_id)
+
+
+@router.get(
+    "/{group_id}",
+    response_model=Group,
+    etag=ETagValidator(_group_version),
+)
 async def get_group(group_id: int) -> Group:
     return await SERVICE.get_group(group_id)
 
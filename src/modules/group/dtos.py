@@ -1,7 +1,10 @@
-from pydantic import BaseModel
+from collections.abc import Sequence
+from typing import Annotated
+
+from pydantic import BaseModel, Field
 
 from src.modules.base.dtos import BaseDto
-from src.modules.user.dtos import User
+from src.modules.user.dtos import PublicUser, User
 
 
 class CreateGroup(BaseModel):
@@ -17,12 +20,27 @@ class GetGroups(BaseModel):
     name: str | None = None
 
 
+class GetGroupUsers(BaseModel):
+    """Get a page of group users DTO."""
+
+    cursor: str | None = None
+    limit: Annotated[int, Field(ge=1, le=100)] = 20
+
+
 class Group(BaseDto):
     name: str
     description: str | None
     owner_id: int
     followers: int = 0
+    members: int = 0
 
 
 class GroupWithOwner(Group):
     owner: User | None
+
+
+class GroupUserPage(BaseModel):
+    """Group users page DTO."""
+
+    items: Sequence[PublicUser]
+    next_cursor: str | None = None
@@ -1,15 +1,28 @@
 from collections.abc import Sequence
 from typing import TYPE_CHECKING, Self
 
-from sqlalchemy import delete, func, select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 
+from src.core.pagination import Cursor
+from src.exceptions.bad_request import InvalidCursorError
 from src.modules.base.repository import BaseRepository
-from src.modules.group.dtos import CreateGroup, GetGroups, Group
-from src.modules.group.table import GroupFollowersTable, GroupTable
+from src.modules.group.dtos import CreateGroup, GetGroups, GetGroupUsers, Group
+from src.modules.group.table import (
+    GroupFollowersTable,
+    GroupMembersTable,
+    GroupTable,
+)
+from src.modules.user.dtos import PublicUser
+from src.modules.user.table import UserTable
+from src.settings import Settings
 
 if TYPE_CHECKING:
-    from src.modules.user.table import UserTable
+    from sqlalchemy import Delete, Insert
+    from sqlalchemy.orm import InstrumentedAttribute
+
+
+_USERS_CURSOR_KEY = "user_id"
 
 
 class GroupRepository(BaseRepository):
@@ -25,29 +38,35 @@ class GroupRepository(BaseRepository):
 
     async def get_group_by_id(self, group_id: int) -> Group | None:
         """Get a group by its ID."""
+        query = select(GroupTable).where(GroupTable.id == group_id)
+        if group := (await self._execute_query(query)).first():
+            return self._to_group(group)
+        return None
+
+    async def get_group_version(self, group_id: int) -> str | None:
+        """Get the version of a group, covering its counts."""
+        query = select(
+            GroupTable.updated_at,
+            GroupTable.follower_count,
+            GroupTable.member_count,
+        ).where(GroupTable.id == group_id)
         async with self._session() as session:
-            query = (
-                select(GroupTable, func.count(GroupTable.followers))
-                .where(GroupTable.id == group_id)
-                .options(joinedload(GroupTable.owner))
-            )
-            if result := (await session.execute(query)).first():
-                table, count = result
-                return Group(**table.model_dump(), followers=count)
-            return None
+            if row := (await session.execute(query)).first():
+                return "|".join(str(value) for value in row)
+        return None
 
     async def create_group(self, user_id: int, params: CreateGroup) -> GroupTable:
         """Create a new group."""
         return await self._save(GroupTable(**params.model_dump(), owner_id=user_id))
 
-    async def get_groups(self, params: GetGroups) -> Sequence[GroupTable]:
+    async def get_groups(self, params: GetGroups) -> Sequence[Group]:
         """Get groups."""
         query = select(GroupTable)
 
         if params.name:
             query = query.where(GroupTable.name.ilike(f"%{params.name}%"))
 
-        return (await self._execute_query(query)).all()
+        return [self._to_group(group) for group in await self._execute_query(query)]
 
     async def delete_group(self, group_id: int, user_id: int) -> None:
         """Delete a group by its ID."""
@@ -57,25 +76,21 @@ class GroupRepository(BaseRepository):
         )
         await self._delete(smt)
 
-    async def get_group_members(self, group_id: int) -> Sequence["UserTable"]:
-        """Get group members."""
-        query = (
-            select(GroupTable)
-            .where(GroupTable.id == group_id)
-            .options(joinedload(GroupTable.members))
-        )
-        response = (await self._execute_query(query)).first()
-        return response.members if response else []
+    async def get_group_members(
+        self,
+        group_id: int,
+        params: GetGroupUsers,
+    ) -> tuple[Sequence[PublicUser], str | None]:
+        """Get a page of group members and the cursor of the next page."""
+        return await self._get_group_users(GroupMembersTable, group_id, params)
 
-    async def get_group_followers(self, group_id: int) -> Sequence["UserTable"]:
-        """Get group followers."""
-        query = (
-            select(GroupTable)
-            .where(GroupTable.id == group_id)
-            .options(joinedload(GroupTable.followers))
-        )
-        response = (await self._execute_query(query)).first()
-        return response.followers if response else []
+    async def get_group_followers(
+        self,
+        group_id: int,
+        params: GetGroupUsers,
+    ) -> tuple[Sequence[PublicUser], str | None]:
+        """Get a page of group followers and the cursor of the next page."""
+        return await self._get_group_users(GroupFollowersTable, group_id, params)
 
     async def check_user_follow(self, group_id: int, user_id: int) -> bool:
         """Check if a user follows a group."""
@@ -85,14 +100,171 @@ class GroupRepository(BaseRepository):
         )
         return bool((await self._execute_query(query)).first())
 
-    async def follow_group(self, group_id: int, user_id: int) -> None:
-        """Follow a group."""
-        await self._save(GroupFollowersTable(group_id=group_id, user_id=user_id))
+    async def follow_group(self, group_id: int, user_id: int) -> bool:
+        """Follow a group. Returns whether the user was not following it."""
+        followed = (
+            insert(GroupFollowersTable)
+            .values(group_id=group_id, user_id=user_id)
+            .on_conflict_do_nothing()
+            .returning(GroupFollowersTable.group_id)
+        )
+        return await self._count_link(followed, GroupTable.follower_count, 1)
 
-    async def unfollow_group(self, group_id: int, user_id: int) -> None:
-        """Unfollow a group."""
-        smt = delete(GroupFollowersTable).where(
-            GroupFollowersTable.group_id == group_id,
-            GroupFollowersTable.user_id == user_id,
+    async def unfollow_group(self, group_id: int, user_id: int) -> bool:
+        """Unfollow a group. Returns whether the user was following it."""
+        unfollowed = (
+            delete(GroupFollowersTable)
+            .where(
+                GroupFollowersTable.group_id == group_id,
+                GroupFollowersTable.user_id == user_id,
+            )
+            .returning(GroupFollowersTable.group_id)
+        )
+        return await self._count_link(unfollowed, GroupTable.follower_count, -1)
+
+    async def add_group_member(self, group_id: int, user_id: int) -> bool:
+        """Add a member to a group. Returns whether the user was not a member."""
+        added = (
+            insert(GroupMembersTable)
+            .values(group_id=group_id, user_id=user_id)
+            .on_conflict_do_nothing()
+            .returning(GroupMembersTable.group_id)
+        )
+        return await self._count_link(added, GroupTable.member_count, 1)
+
+    async def remove_group_member(self, group_id: int, user_id: int) -> bool:
+        """Remove a member from a group. Returns whether the user was a member."""
+        removed = (
+            delete(GroupMembersTable)
+            .where(
+                GroupMembersTable.group_id == group_id,
+                GroupMembersTable.user_id == user_id,
+            )
+            .returning(GroupMembersTable.group_id)
+        )
+        return await self._count_link(removed, GroupTable.member_count, -1)
+
+    async def reconcile_group_counts(self) -> None:
+        """Recompute the follower and member counts of every group.
+
+        Fixes any drift between the counts and `db_group_followers` and
+        `db_group_members`. Groups are updated in ID order, in batches of
+        `Settings.GROUP_COUNTS_RECONCILE_BATCH`, each in its own transaction
+        so hot group rows are only locked briefly.
+        """
+        followers = (
+            select(func.count())
+            .where(GroupFollowersTable.group_id == GroupTable.id)
+            .scalar_subquery()
+        )
+        members = (
+            select(func.count())
+            .where(GroupMembersTable.group_id == GroupTable.id)
+            .scalar_subquery()
+        )
+
+        after = 0
+        while True:
+            async with self._session() as session:
+                group_ids = (
+                    await session.scalars(
+                        select(GroupTable.id)
+                        .where(GroupTable.id > after)
+                        .order_by(GroupTable.id)
+                        .limit(Settings.GROUP_COUNTS_RECONCILE_BATCH),
+                    )
+                ).all()
+                if not group_ids:
+                    return
+
+                await session.execute(
+                    update(GroupTable)
+                    .where(
+                        GroupTable.id.between(group_ids[0], group_ids[-1]),
+                        tuple_(
+                            GroupTable.follower_count,
+                            GroupTable.member_count,
+                        ).is_distinct_from(tuple_(followers, members)),
+                    )
+                    .values(
+                        follower_count=followers,
+                        member_count=members,
+                        updated_at=GroupTable.updated_at,
+                    ),
+                )
+                await session.commit()
+            after = group_ids[-1]
+
+    async def _count_link(
+        self,
+        statement: "Insert | Delete",
+        counter: "InstrumentedAttribute[int]",
+        delta: int,
+    ) -> bool:
+        """Run a link change and count it on its group, in one statement.
+
+        `statement` returns the `group_id` of the changed link, if any.
+        """
+        changed = statement.cte("changed")
+        query = (
+            update(GroupTable)
+            .add_cte(changed)
+            .where(GroupTable.id == changed.c.group_id)
+            .values(
+                {
+                    counter: counter + delta,
+                    GroupTable.updated_at: GroupTable.updated_at,
+                },
+            )
+            .returning(GroupTable.id)
+            .execution_options(synchronize_session=False)
+        )
+        async with self._session() as session:
+            result = (await session.execute(query)).first()
+            await session.commit()
+        return result is not None
+
+    async def _get_group_users(
+        self,
+        table: type[GroupMembersTable | GroupFollowersTable],
+        group_id: int,
+        params: GetGroupUsers,
+    ) -> tuple[Sequence[PublicUser], str | None]:
+        """Get a page of the users linked to a group by `table`.
+
+        Users are paginated by keyset on the user ID, read from the `(group_id,
+        user_id)` primary key of the link table, and only the `PublicUser`
+        columns are selected, so emails are never exposed.
+        """
+        query = (
+            select(
+                UserTable.id,
+                UserTable.created_at,
+                UserTable.username,
+            )
+            .join(table, table.user_id == UserTable.id)
+            .where(table.group_id == group_id)
+            .order_by(table.user_id)
+            .limit(params.limit + 1)
+        )
+        if params.cursor:
+            (after,) = Cursor.decode(params.cursor, _USERS_CURSOR_KEY, 1)
+            if not isinstance(after, int):
+                raise InvalidCursorError(cursor=params.cursor)
+            query = query.where(table.user_id > after)
+
+        async with self._session() as session:
+            rows = (await session.execute(query)).mappings().all()
+
+        users = [PublicUser(**row) for row in rows[: params.limit]]
+        if len(rows) <= params.limit:
+            return users, None
+        return users, Cursor.encode(_USERS_CURSOR_KEY, users[-1].id)
+
+    @staticmethod
+    def _to_group(group: GroupTable) -> Group:
+        return Group(
+            **group.model_dump(),
+            followers=group.follower_count,
+            members=group.member_count,
         )
-        await self._delete(smt)
@@ -1,23 +1,32 @@
 from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
-from src.exceptions.not_found import GroupNotFoundError
-from src.modules.group.dtos import CreateGroup, GetGroups, Group
-from src.modules.user.dtos import User
+from src.exceptions.forbidden import NotGroupOwnerError
+from src.exceptions.not_found import GroupNotFoundError, UserNotFoundError
+from src.modules.group.dtos import (
+    CreateGroup,
+    GetGroups,
+    GetGroupUsers,
+    Group,
+    GroupUserPage,
+)
 
 if TYPE_CHECKING:
     from src.modules.group.repository import GroupRepository
+    from src.modules.user.repository import UserRepository
 
 
 class GroupService:
-    def __init__(self, group_repository: "GroupRepository") -> None:
+    def __init__(
+        self,
+        group_repository: "GroupRepository",
+        user_repository: "UserRepository",
+    ) -> None:
         self.repository = group_repository
+        self.user_repository = user_repository
 
     async def get_groups(self, params: GetGroups) -> Sequence[Group]:
-        return [
-            Group(**data.model_dump())
-            for data in await self.repository.get_groups(params)
-        ]
+        return await self.repository.get_groups(params)
 
     async def create_group(self, user_id: int, params: CreateGroup) -> Group:
         return Group(
@@ -32,21 +41,62 @@ class GroupService:
 
         raise GroupNotFoundError
 
-    async def get_group_members(self, group_id: int) -> Sequence["User"]:
-        return [
-            User(**data.model_dump())
-            for data in await self.repository.get_group_members(group_id)
-        ]
+    async def get_group_version(self, group_id: int) -> str | None:
+        return await self.repository.get_group_version(group_id)
+
+    async def get_group_members(
+        self,
+        group_id: int,
+        params: GetGroupUsers,
+    ) -> GroupUserPage:
+        users, next_cursor = await self.repository.get_group_members(group_id, params)
+        return GroupUserPage(items=users, next_cursor=next_cursor)
+
+    async def get_group_followers(
+        self,
+        group_id: int,
+        params: GetGroupUsers,
+    ) -> GroupUserPage:
+        users, next_cursor = await self.repository.get_group_followers(
+            group_id,
+            params,
+        )
+        return GroupUserPage(items=users, next_cursor=next_cursor)
 
     async def check_user_follow(self, group_id: int, user_id: int) -> bool:
         return await self.repository.check_user_follow(group_id, user_id)
 
     async def follow_group(self, group_id: int, user_id: int) -> None:
-        if await self.repository.check_user_follow(group_id, user_id):
-            return None
-        return await self.repository.follow_group(group_id, user_id)
+        await self.repository.follow_group(group_id, user_id)
 
     async def unfollow_group(self, group_id: int, user_id: int) -> None:
-        if not await self.repository.check_user_follow(group_id, user_id):
-            return None
-        return await self.repository.unfollow_group(group_id, user_id)
+        await self.repository.unfollow_group(group_id, user_id)
+
+    async def add_group_member(
+        self,
+        group_id: int,
+        owner_id: int,
+        user_id: int,
+    ) -> None:
+        await self._check_owner(group_id, owner_id)
+
+        if not await self.user_repository.get_user_by_id(user_id):
+            raise UserNotFoundError
+
+        await self.repository.add_group_member(group_id, user_id)
+
+    async def remove_group_member(
+        self,
+        group_id: int,
+        owner_id: int,
+        user_id: int,
+    ) -> None:
+        await self._check_owner(group_id, owner_id)
+        await self.repository.remove_group_member(group_id, user_id)
+
+    async def _check_owner(self, group_id: int, user_id: int) -> None:
+        """Raise unless the group exists and is owned by the user."""
+        group = await self.get_group(group_id)
+
+        if group.owner_id != user_id:
+            raise NotGroupOwnerError
@@ -39,6 +39,9 @@ class GroupTable(BaseTable):
         unique=True,
     )
 
+    follower_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    member_count: Mapped[int] = mapped_column(default=0, server_default="0")
+
     owner: Mapped["UserTable"] = relationship("UserTable", back_populates="group")
 
     members: Mapped[list["UserTable"]] = relationship(
@@ -1,23 +1,62 @@
 from collections.abc import Sequence
 from typing import Annotated
 
-from fastapi import Body, Path, Query
+from fastapi import Body, Path, Query, Response
 
+from src.core.etag import ETagValidator
 from src.core.router import ApiRouter
+from src.exceptions.bad_request import InvalidTagMergeError, MissingParamsError
 from src.exceptions.not_found import TagNotFoundError
-from src.modules.tag.dtos import CreateTag, GetTags, Tag, UpdateTag
+from src.modules.tag.dtos import (
+    CreateTag,
+    GetTags,
+    GetTagSuggestions,
+    RetaggedTitles,
+    RetagTitles,
+    Tag,
+    TagSuggestion,
+    TagWithUsage,
+    UpdateTag,
+)
 from src.modules.tag.repository import TagRepository
 from src.modules.tag.service import TagService
+from src.modules.title.repository import TitleRepository
 
 router = ApiRouter(prefix="/tag", tags=["tag"])
 
-SERVICE = TagService(TagRepository())
+SERVICE = TagService(TagRepository(), TitleRepository())
+
+
+async def _tags_version(params: Annotated[GetTags, Query()]) -> str | None:
+    return await SERVICE.get_tags_version(params)
 
 
-@router.get("", response_model=Sequence[Tag])
-async def get_tags(params: Annotated[GetTags, Query()]) -> Sequence[Tag]:
-    """Get all tags."""
-    return await SERVICE.get_tags(params)
+@router.get(
+    "",
+    response_model=Sequence[TagWithUsage],
+    etag=ETagValidator(_tags_version),
+)
+async def get_tags(
+    params: Annotated[GetTags, Query()],
+    response: Response,
+) -> Response:
+    """Get all tags.
+
+    Usage counts are only listed when sorting or filtering by them.
+    """
+    return Response(
+        content=await SERVICE.get_tags_json(params),
+        media_type="application/json",
+        headers=response.headers,
+    )
+
+
+@router.get("/autocomplete", response_model=Sequence[TagSuggestion])
+async def get_tag_suggestions(
+    params: Annotated[GetTagSuggestions, Query()],
+) -> Sequence[TagSuggestion]:
+    """Get the most used tags with a word starting with a prefix."""
+    return await SERVICE.get_tag_suggestions(params)
 
 
 @router.get("/{tag_id}", response_model=Tag, exceptions=[TagNotFoundError()])
@@ -55,3 +94,31 @@ async def update_tag(
 async def delete_tag(tag_id: Annotated[int, Path()]) -> None:
     """Delete a tag."""
     await SERVICE.delete_tag(tag_id)
+
+
+@router.post(
+    "/{tag_id}/merge-into/{target_id}",
+    response_model=RetaggedTitles,
+    exceptions=[TagNotFoundError(), InvalidTagMergeError()],
+    requires_login=True,
+)
+async def merge_tag(
+    tag_id: Annotated[int, Path()],
+    target_id: Annotated[int, Path()],
+) -> RetaggedTitles:
+    """Move the titles of a tag to another tag, and delete the tag."""
+    return await SERVICE.merge_tag(tag_id, target_id)
+
+
+@router.post(
+    "/{tag_id}/retag",
+    response_model=RetaggedTitles,
+    exceptions=[TagNotFoundError(), MissingParamsError()],
+    requires_login=True,
+)
+async def retag_titles(
+    tag_id: Annotated[int, Path()],
+    params: Annotated[RetagTitles, Body()],
+) -> RetaggedTitles:
+    """Remove and then add tags to every title carrying a tag."""
+    return await SERVICE.retag_titles(tag_id, params)
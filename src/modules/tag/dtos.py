@@ -1,9 +1,10 @@
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Annotated
 
 from pydantic import BaseModel, Field
 
-from src.modules.tag.enums import TagGroupEnum
+from src.modules.tag.enums import TagGroupEnum, TagSortEnum
 
 
 class Tag(BaseModel):
@@ -24,5 +25,30 @@ class UpdateTag(BaseModel):
     name: Annotated[str | None, Field(max_length=100)] = None
 
 
+class TagWithUsage(Tag):
+    usage_count: int | None = None
+
+
 class GetTags(BaseModel):
     include_not_active: bool = False
+    sort_by: TagSortEnum = TagSortEnum.ID
+    min_usage: Annotated[int | None, Field(ge=0)] = None
+
+
+class GetTagSuggestions(BaseModel):
+    q: Annotated[str, Field(min_length=1, max_length=100)]
+    group: TagGroupEnum | None = None
+    limit: Annotated[int, Field(ge=1, le=50)] = 10
+
+
+class TagSuggestion(Tag):
+    usage: int
+
+
+class RetagTitles(BaseModel):
+    add: Sequence[int] = []
+    remove: Sequence[int] = []
+
+
+class RetaggedTitles(BaseModel):
+    titles: int
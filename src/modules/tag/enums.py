@@ -7,3 +7,8 @@ class TagGroupEnum(StrEnum):
     GENRE = "GENRE"
     THEME = "THEME"
     FORMAT = "FORMAT"
+
+
+class TagSortEnum(StrEnum):
+    ID = "ID"
+    USAGE = "USAGE"
@@ -0,0 +1,40 @@
+import bisect
+from collections.abc import Iterable
+
+from src.modules.tag.dtos import Tag
+from src.modules.tag.enums import TagGroupEnum
+
+
+class TagPrefixIndex:
+    """Sorted-array prefix index of active tag names.
+
+    Holds, for every tag group and for all groups together, the casefolded
+    name of each tag and every word suffix of it (so "Slice of Life" is also
+    found by "life"), sorted. The keys starting with a prefix are a contiguous
+    run found by bisection.
+    """
+
+    def __init__(self, tags: Iterable[Tag]) -> None:
+        keys: dict[TagGroupEnum | None, list[tuple[str, int]]] = {}
+        for tag in tags:
+            if not tag.is_active:
+                continue
+            words = tag.name.casefold().split()
+            for start in range(len(words)):
+                key = (" ".join(words[start:]), tag.id)
+                for group in (None, tag.group):
+                    keys.setdefault(group, []).append(key)
+
+        self._keys = {group: sorted(group_keys) for group, group_keys in keys.items()}
+
+    def search(self, prefix: str, group: TagGroupEnum | None = None) -> list[int]:
+        """Get the IDs of the active tags with a word starting with `prefix`."""
+        prefix = " ".join(prefix.casefold().split())
+        keys = self._keys.get(group, [])
+
+        tag_ids: dict[int, None] = {}
+        position = bisect.bisect_left(keys, (prefix,))
+        while position < len(keys) and keys[position][0].startswith(prefix):
+            tag_ids[keys[position][1]] = None
+            position += 1
+        return list(tag_ids)
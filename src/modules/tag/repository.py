@@ -1,37 +1,167 @@
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
 from typing import Self
 
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import Sequence as DbSequence
+from sqlalchemy import String, cast, func, select, text
 
 from src.modules.base.repository import BaseRepository
-from src.modules.tag.dtos import CreateTag, GetTags, UpdateTag
+from src.modules.base.table import BaseTable
+from src.modules.tag.dtos import CreateTag, GetTags, Tag, TagWithUsage, UpdateTag
+from src.modules.tag.enums import TagSortEnum
+from src.modules.tag.index import TagPrefixIndex
 from src.modules.tag.table import TagTable
 
+TAGS_CHANNEL = "tags"
+
+_TAG_VERSION = DbSequence("db_tag_version_seq", metadata=BaseTable.metadata)
+
+_TAGS_ADAPTER = TypeAdapter(list[Tag])
+
+
+class TagSnapshot:
+    """Immutable tag catalog at a version, with its pre-serialized JSON bodies.
+
+    `usage` holds the `db_tags.usage_count` of every tag. Usage counts move
+    without the tag version, so they are replaced on their own.
+    """
+
+    __slots__ = ("_json", "by_id", "prefixes", "tags", "usage", "version")
+
+    def __init__(
+        self,
+        version: int,
+        tags: Sequence[Tag],
+        usage: Mapping[int, int],
+    ) -> None:
+        self.version = version
+        self.usage: Mapping[int, int] = MappingProxyType(dict(usage))
+        self.tags: tuple[Tag, ...] = tuple(tags)
+        self.by_id: Mapping[int, Tag] = MappingProxyType(
+            {tag.id: tag for tag in self.tags},
+        )
+        self.prefixes = TagPrefixIndex(self.tags)
+        active = [tag for tag in self.tags if tag.is_active]
+        self._json = {
+            True: _TAGS_ADAPTER.dump_json(list(self.tags)),
+            False: _TAGS_ADAPTER.dump_json(active),
+        }
+
+    def get_tags(self, params: GetTags) -> list[Tag]:
+        """Get the tags, only the active ones unless asked otherwise."""
+        if params.include_not_active:
+            return list(self.tags)
+        return [tag for tag in self.tags if tag.is_active]
+
+    def get_json(self, params: GetTags) -> bytes:
+        """Get the JSON body of `get_tags`."""
+        return self._json[params.include_not_active]
+
 
 class TagRepository(BaseRepository):
+    """Tag repository.
+
+    Reads are answered from an in-process `TagSnapshot`, reloaded once the tag
+    version moves past it. The version is a database sequence bumped after
+    every tag change and broadcast with `NOTIFY` on `TAGS_CHANNEL`, so every
+    worker sees it.
+    """
+
     __instance: Self | None = None
 
+    _snapshot: TagSnapshot | None = None
+    _version: int = 0
+
     def __new__(cls) -> Self:
         if cls.__instance is None:
             cls.__instance = super().__new__(cls)
         return cls.__instance
 
+    @property
+    def version(self) -> int:
+        """The latest known tag version."""
+        return self._version
+
+    def on_notify(self, payload: str | None) -> None:
+        """Record a tag version broadcast by a worker, or drop the snapshot."""
+        if payload is None:
+            self._snapshot = None
+        elif payload.isdigit():
+            self._version = max(self._version, int(payload))
+
+    async def get_snapshot(self) -> TagSnapshot:
+        """Get the tag snapshot, reloading it if a newer version exists.
+
+        The version is read before the tags, so a snapshot is never labeled
+        with a version newer than its content.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version >= self._version:
+            return snapshot
+
+        version_query = text(
+            f"SELECT CASE WHEN is_called THEN last_value ELSE 0 END "  # noqa: S608
+            f"FROM {_TAG_VERSION.name}",
+        )
+        async with self._session() as session:
+            version = (await session.execute(version_query)).scalar_one()
+            tags = (await session.scalars(select(TagTable).order_by(TagTable.id))).all()
+
+        snapshot = TagSnapshot(
+            version,
+            [Tag(**tag.model_dump()) for tag in tags],
+            {tag.id: tag.usage_count for tag in tags},
+        )
+        self._snapshot = snapshot
+        self._version = max(self._version, version)
+        return snapshot
+
+    async def refresh_usage(self) -> None:
+        """Reload the usage counts of the current tag snapshot."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+
+        query = select(TagTable.id, TagTable.usage_count)
+        async with self._session() as session:
+            usage = (await session.execute(query)).tuples().all()
+        snapshot.usage = MappingProxyType(dict(usage))
+
     async def get_tag(self, tag_id: int) -> TagTable | None:
         query = select(TagTable).filter(TagTable.id == tag_id)
         return (await self._execute_query(query)).first()
 
-    async def get_tags(self, params: GetTags) -> Sequence[TagTable]:
-        query = select(TagTable).where(TagTable.is_active)
-        if params.include_not_active:
-            query = select(TagTable)
-        return (await self._execute_query(query)).all()
+    async def get_tags_version(self) -> str:
+        """Get the version of the tags list."""
+        return str((await self.get_snapshot()).version)
+
+    async def get_tags(self, params: GetTags) -> Sequence[Tag]:
+        return (await self.get_snapshot()).get_tags(params)
+
+    async def get_tags_by_usage(self, params: GetTags) -> Sequence[TagWithUsage]:
+        """Get the tags with their usage count, read from the database."""
+        query = select(TagTable)
+        if not params.include_not_active:
+            query = query.where(TagTable.is_active)
+        if params.min_usage is not None:
+            query = query.where(TagTable.usage_count >= params.min_usage)
+        if params.sort_by == TagSortEnum.USAGE:
+            query = query.order_by(TagTable.usage_count.desc(), TagTable.id)
+        else:
+            query = query.order_by(TagTable.id)
 
-    async def get_tags_by_ids(self, tag_ids: Sequence[int]) -> Sequence[TagTable]:
-        query = select(TagTable).where(TagTable.id.in_(tag_ids))
-        return (await self._execute_query(query)).all()
+        tags = (await self._execute_query(query)).all()
+        return [TagWithUsage(**tag.model_dump()) for tag in tags]
+
+    async def get_tags_by_ids(self, tag_ids: Sequence[int]) -> Sequence[Tag]:
+        by_id = (await self.get_snapshot()).by_id
+        return [by_id[tag_id] for tag_id in dict.fromkeys(tag_ids) if tag_id in by_id]
 
     async def create_tag(self, params: CreateTag) -> TagTable:
-        return await self._save(TagTable(**params.model_dump()))
+        tag = await self._save(TagTable(**params.model_dump()))
+        await self.bump_version()
+        return tag
 
     async def update_tag(
         self,
@@ -39,8 +169,26 @@ class TagRepository(BaseRepository):
         params: UpdateTag,
     ) -> TagTable:
         tag.update(params)
-        return await self._save(tag)
+        tag = await self._save(tag)
+        await self.bump_version()
+        return tag
 
     async def delete_tag(self, tag: "TagTable") -> None:
         tag.is_active = False
         await self._save(tag)
+        await self.bump_version()
+
+    async def bump_version(self) -> None:
+        """Bump and broadcast the tag version, once the change is committed.
+
+        Titles embed their tags, so this also retires every cached title.
+        """
+        version = select(_TAG_VERSION.next_value().label("version")).subquery()
+        query = select(
+            version.c.version,
+            func.pg_notify(TAGS_CHANNEL, cast(version.c.version, String)),
+        )
+        async with self._session() as session:
+            new_version = (await session.execute(query)).scalar_one()
+            await session.commit()
+        self._version = max(self._version, new_version)
@@ -1,31 +1,101 @@
+import heapq
 from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
-from src.exceptions.bad_request import MissingParamsError
+from pydantic import TypeAdapter
+
+from src.exceptions.bad_request import InvalidTagMergeError, MissingParamsError
 from src.exceptions.not_found import TagNotFoundError
-from src.modules.tag.dtos import CreateTag, GetTags, Tag, UpdateTag
+from src.modules.tag.dtos import (
+    CreateTag,
+    GetTags,
+    GetTagSuggestions,
+    RetaggedTitles,
+    RetagTitles,
+    Tag,
+    TagSuggestion,
+    TagWithUsage,
+    UpdateTag,
+)
+from src.modules.tag.enums import TagSortEnum
 
 if TYPE_CHECKING:
     from src.modules.tag.repository import TagRepository
+    from src.modules.title.repository import TitleRepository
+
+_TAGS_WITH_USAGE = TypeAdapter(list[TagWithUsage])
 
 
 class TagService:
-    def __init__(self, tag_repository: "TagRepository") -> None:
+    def __init__(
+        self,
+        tag_repository: "TagRepository",
+        title_repository: "TitleRepository",
+    ) -> None:
         self.repository = tag_repository
+        self.title_repository = title_repository
 
     async def get_tag(self, tag_id: int) -> Tag:
         """Get a tag by ID."""
-        tag = await self.repository.get_tag(tag_id)
+        tag = (await self.repository.get_snapshot()).by_id.get(tag_id)
 
         if not tag:
             raise TagNotFoundError
 
-        return Tag(**tag.__dict__)
+        return tag
+
+    async def get_tags_version(self, params: GetTags) -> str | None:
+        """Get the version of the tags list, for conditional requests.
+
+        Usage counts change without moving the tag version, so lists reading
+        them have none.
+        """
+        if self._reads_usage(params):
+            return None
+        return await self.repository.get_tags_version()
 
     async def get_tags(self, params: GetTags) -> Sequence[Tag]:
         """Get all tags."""
-        tags = await self.repository.get_tags(params)
-        return [Tag(**tag.__dict__) for tag in tags]
+        if self._reads_usage(params):
+            return await self.repository.get_tags_by_usage(params)
+        return await self.repository.get_tags(params)
+
+    async def get_tags_json(self, params: GetTags) -> bytes:
+        """Get all tags, already serialized as JSON."""
+        if self._reads_usage(params):
+            tags = await self.repository.get_tags_by_usage(params)
+            return _TAGS_WITH_USAGE.dump_json(list(tags))
+        return (await self.repository.get_snapshot()).get_json(params)
+
+    @staticmethod
+    def _reads_usage(params: GetTags) -> bool:
+        """Whether the tags are sorted or filtered by their usage count."""
+        return params.sort_by == TagSortEnum.USAGE or params.min_usage is not None
+
+    async def get_tag_suggestions(
+        self,
+        params: GetTagSuggestions,
+    ) -> list[TagSuggestion]:
+        """Get the most used active tags with a word starting with a prefix.
+
+        Tags are ranked by the usage counts of the tag snapshot, refreshed every
+        `Settings.TAG_USAGE_REFRESH_INTERVAL` seconds.
+        """
+        snapshot = await self.repository.get_snapshot()
+        tag_ids = snapshot.prefixes.search(params.q, params.group)
+        usage = snapshot.usage
+        best = heapq.nsmallest(
+            params.limit,
+            tag_ids,
+            key=lambda tag_id: (-usage.get(tag_id, 0), snapshot.by_id[tag_id].name),
+        )
+        return [
+            TagSuggestion(
+                **snapshot.by_id[tag_id].model_dump(),
+                usage=usage.get(tag_id, 0),
+            )
+            for tag_id in best
+        ]
 
     async def create_tag(self, create_tag: CreateTag) -> Tag:
         """Create a tag."""
@@ -54,3 +124,42 @@ class TagService:
             raise TagNotFoundError
 
         await self.repository.delete_tag(tag)
+
+    async def merge_tag(self, tag_id: int, target_id: int) -> RetaggedTitles:
+        """Move the titles of a tag to another tag, and delete the tag."""
+        if tag_id == target_id:
+            raise InvalidTagMergeError
+
+        tag = await self.repository.get_tag(tag_id)
+        target = await self.repository.get_tag(target_id)
+
+        if not tag or not target or not target.is_active:
+            raise TagNotFoundError
+
+        titles = await self.title_repository.retag_titles(
+            tag_id,
+            add=[target_id],
+            remove=[tag_id],
+            deactivate=True,
+        )
+        await self.repository.bump_version()
+        return RetaggedTitles(titles=titles)
+
+    async def retag_titles(
+        self,
+        tag_id: int,
+        params: RetagTitles,
+    ) -> RetaggedTitles:
+        """Remove and then add tags to every title carrying a tag."""
+        if not params.add and not params.remove:
+            raise MissingParamsError
+
+        if not await self.repository.get_tag(tag_id):
+            raise TagNotFoundError
+
+        titles = await self.title_repository.retag_titles(
+            tag_id,
+            add=params.add,
+            remove=params.remove,
+        )
+        return RetaggedTitles(titles=titles)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, String
+from sqlalchemy import DateTime, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src._utils import current_datetime
@@ -16,6 +16,9 @@ class TagTable(BaseTable):
     """Tag model."""
 
     __tablename__ = "db_tags"
+    __table_args__ = (
+        Index("ix_db_tags_usage_count_id", text("usage_count DESC"), "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, sort_order=-1)
     created_at: Mapped[datetime] = mapped_column(
@@ -33,6 +36,7 @@ class TagTable(BaseTable):
     name: Mapped[str] = mapped_column(__type_pos=String(100), unique=True)
     group: Mapped[TagGroupEnum] = mapped_column(__type_pos=String(100), index=True)
     is_active: Mapped[bool] = mapped_column(default=True)
+    usage_count: Mapped[int] = mapped_column(default=0, server_default="0")
 
     titles: Mapped[list["TitleTable"]] = relationship(
         "TitleTable",
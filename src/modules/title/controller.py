@@ -1,35 +1,129 @@
 from collections.abc import Sequence
 from typing import Annotated
 
-from fastapi import Body, File, Path, Query, Request, UploadFile
+from fastapi import Body, File, Path, Query, Request, Security, UploadFile
 from fastapi.responses import StreamingResponse
 
+from src.core.contexts.aws_s3 import S3ClientStats
+from src.core.etag import ETagValidator
 from src.core.router import ApiRouter
+from src.core.uploads import iter_file
+from src.exceptions.bad_request import (
+    InvalidCoverUploadError,
+    InvalidCursorError,
+    InvalidMimeTypeError,
+)
 from src.exceptions.conflict import TitleNameAlreadyExistsError
 from src.exceptions.not_found import TagNotFoundError, TitleNotFoundError
-from src.modules._rating_dto import CreateRating, PostRating, Rating
+from src.exceptions.payload_too_large import FileTooLargeError
+from src.exceptions.unauthorized import InvalidTokenError
+from src.modules._rating_dto import (
+    GetRatings,
+    PostedRating,
+    PostRating,
+    Rating,
+    TargetRating,
+)
 from src.modules.tag.repository import TagRepository
 from src.modules.title.dtos import (
+    CompleteCoverUpload,
+    CoverUpload,
+    CreateCoverUpload,
     CreateTitle,
+    GetRankedTitles,
+    GetSimilarTitles,
     GetTitles,
+    ImportTitles,
+    PartialTitle,
+    ScoredTitle,
+    SearchTitles,
     Title,
+    TitleFields,
+    TitleImportReport,
+    TitleIndexStats,
+    TitlePage,
+    TitleTagIds,
     UpdateTitle,
+    UpdateTitlesTags,
     UpdateTitleTags,
 )
 from src.modules.title.repository import TitleRepository
 from src.modules.title.service import TitleService
+from src.security.auth import OptionalAuthSecurity
 
 router = ApiRouter(prefix="/title", tags=["title"])
 
 SERVICE = TitleService(TitleRepository(), TagRepository())
 
 
-@router.get(path="", response_model=Sequence[Title])
-async def get_titles(params: Annotated[GetTitles, Query()]) -> Sequence[Title]:
-    """Get all titles."""
+@router.get(
+    path="",
+    response_model=TitlePage,
+    response_model_exclude_unset=True,
+    exceptions=[InvalidCursorError(cursor="abc")],
+)
+async def get_titles(params: Annotated[GetTitles, Query()]) -> TitlePage:
+    """Get a page of titles, with only the selected `fields` if any."""
     return await SERVICE.get_titles(params)
 
 
+@router.get(path="/search", response_model=Sequence[ScoredTitle])
+async def search_titles(
+    params: Annotated[SearchTitles, Query()],
+) -> Sequence[ScoredTitle]:
+    """Search titles by name and description, ranked by relevance."""
+    return await SERVICE.search_titles(params)
+
+
+@router.get(path="/top", response_model=Sequence[ScoredTitle])
+async def get_top_titles(
+    params: Annotated[GetRankedTitles, Query()],
+) -> Sequence[ScoredTitle]:
+    """Get the top-rated titles, ranked by the Bayesian average of their ratings."""
+    return await SERVICE.get_top_titles(params)
+
+
+@router.get(path="/trending", response_model=Sequence[ScoredTitle])
+async def get_trending_titles(
+    params: Annotated[GetRankedTitles, Query()],
+) -> Sequence[ScoredTitle]:
+    """Get the trending titles, ranked by their recent rating activity."""
+    return await SERVICE.get_trending_titles(params)
+
+
+@router.get(path="/index", response_model=TitleIndexStats, requires_login=True)
+async def get_index_stats() -> TitleIndexStats:
+    """Get the title tag index statistics."""
+    return SERVICE.get_index_stats()
+
+
+@router.get(path="/storage", response_model=S3ClientStats, requires_login=True)
+async def get_storage_stats() -> S3ClientStats:
+    """Get the cover storage clients and connection pool statistics."""
+    return SERVICE.get_storage_stats()
+
+
+@router.post(path="/index/rebuild", response_model=TitleIndexStats, requires_login=True)
+async def rebuild_index() -> TitleIndexStats:
+    """Rebuild the title tag index from the database."""
+    return await SERVICE.rebuild_index()
+
+
+@router.get(
+    path="/ratings",
+    response_model=Sequence[TargetRating],
+    dependencies=[Security(OptionalAuthSecurity())],
+    exceptions=[InvalidTokenError()],
+)
+async def get_title_ratings(
+    request: Request,
+    params: Annotated[GetRatings, Query()],
+) -> Sequence[TargetRating]:
+    """Get the ratings of many titles, with the user's own rating if logged in."""
+    user = request.state.user
+    return await SERVICE.get_title_ratings(params, user.id if user else None)
+
+
 @router.post(
     path="",
     response_model=Title,
@@ -41,14 +135,40 @@ async def create_title(create_title: Annotated[CreateTitle, Body()]) -> Title:
     return await SERVICE.create_title(create_title)
 
 
+@router.post(path="/import", response_model=TitleImportReport, requires_login=True)
+async def import_titles(
+    params: Annotated[ImportTitles, Query()],
+    file: Annotated[UploadFile, File()],
+) -> TitleImportReport:
+    """Create titles in bulk from an NDJSON or CSV file."""
+    return await SERVICE.import_titles(file, params)
+
+
+@router.patch(path="/tags", response_model=Sequence[TitleTagIds], requires_login=True)
+async def update_titles_tags(
+    params: Annotated[UpdateTitlesTags, Body()],
+) -> Sequence[TitleTagIds]:
+    """Remove and then add tags to many titles at once."""
+    return await SERVICE.update_titles_tags(params)
+
+
+async def _title_version(title_id: Annotated[int, Path()]) -> str | None:
+    return await SERVICE.get_title_version(title_id)
+
+
 @router.get(
     path="/{title_id}",
-    response_model=Title,
+    response_model=PartialTitle,
+    response_model_exclude_unset=True,
     exceptions=[TitleNotFoundError(titleId=123)],
+    etag=ETagValidator(_title_version),
 )
-async def get_title(title_id: Annotated[int, Path()]) -> Title:
-    """Get a title by ID."""
-    return await SERVICE.get_title(title_id)
+async def get_title(
+    title_id: Annotated[int, Path()],
+    params: Annotated[TitleFields, Query()],
+) -> PartialTitle:
+    """Get a title by ID, with only the selected `fields` if any."""
+    return await SERVICE.get_partial_title(title_id, params)
 
 
 @router.patch(
@@ -107,6 +227,19 @@ async def remove_title_tags(
     return await SERVICE.remove_tags(title_id, params)
 
 
+@router.get(
+    path="/{title_id}/similar",
+    response_model=Sequence[ScoredTitle],
+    exceptions=[TitleNotFoundError(titleId=123)],
+)
+async def get_similar_titles(
+    title_id: Annotated[int, Path()],
+    params: Annotated[GetSimilarTitles, Query()],
+) -> Sequence[ScoredTitle]:
+    """Get the titles sharing the most tags with a title, rarer tags weighing more."""
+    return await SERVICE.get_similar_titles(title_id, params)
+
+
 @router.get("/{title_id}/rating", response_model=Rating)
 async def get_title_rating(
     title_id: Annotated[int, Path()],
@@ -117,15 +250,15 @@ async def get_title_rating(
 
 @router.post(
     path="/{title_id}/rating",
-    response_model=CreateRating,
+    response_model=PostedRating,
     requires_login=True,
 )
 async def create_title_rating(
     request: Request,
     title_id: Annotated[int, Path()],
     params: Annotated[PostRating, Body()],
-) -> CreateRating:
-    """Create a rating for a title."""
+) -> PostedRating:
+    """Create or change the rating of the user for a title."""
     return await SERVICE.post_title_rating(request.state.user.id, title_id, params)
 
 
@@ -146,10 +279,76 @@ async def delete_title_rating(
     path="/{title_id}/cover",
     requires_login=True,
     response_class=StreamingResponse,
+    exceptions=[
+        TitleNotFoundError(titleId=123),
+        InvalidMimeTypeError(expectedMimeType="jpeg", mimeType="text/plain"),
+        FileTooLargeError(maxSize=123),
+    ],
 )
 async def upload_title_cover(
     title_id: Annotated[int, Path()],
     file: Annotated[UploadFile, File()],
 ) -> str:
     """Upload a title cover."""
-    return await SERVICE.post_title_cover(title_id, file)
+    return await SERVICE.post_title_cover(title_id, iter_file(file), file.size)
+
+
+@router.put(
+    path="/{title_id}/cover",
+    requires_login=True,
+    response_class=StreamingResponse,
+    exceptions=[
+        TitleNotFoundError(titleId=123),
+        InvalidMimeTypeError(expectedMimeType="jpeg", mimeType="text/plain"),
+        FileTooLargeError(maxSize=123),
+    ],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"image/*": {"schema": {"type": "string", "format": "binary"}}},
+        },
+    },
+)
+async def put_title_cover(request: Request, title_id: Annotated[int, Path()]) -> str:
+    """Upload a title cover from the raw request body, streamed straight to S3."""
+    size = request.headers.get("Content-Length")
+    return await SERVICE.post_title_cover(
+        title_id,
+        request.stream(),
+        int(size) if size and size.isdigit() else None,
+    )
+
+
+@router.post(
+    path="/{title_id}/cover/upload",
+    response_model=CoverUpload,
+    requires_login=True,
+    exceptions=[TitleNotFoundError(titleId=123)],
+)
+async def create_title_cover_upload(
+    title_id: Annotated[int, Path()],
+    params: Annotated[CreateCoverUpload, Body()],
+) -> CoverUpload:
+    """Create a presigned URL to upload a title cover straight to storage."""
+    return await SERVICE.create_cover_upload(title_id, params)
+
+
+@router.post(
+    path="/{title_id}/cover/complete",
+    response_model=Title,
+    requires_login=True,
+    exceptions=[
+        TitleNotFoundError(titleId=123),
+        InvalidCoverUploadError(
+            coverKey="covers/e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
+        ),
+        InvalidMimeTypeError(expectedMimeType="jpeg", mimeType="text/plain"),
+        FileTooLargeError(maxSize=123),
+    ],
+)
+async def complete_title_cover_upload(
+    title_id: Annotated[int, Path()],
+    params: Annotated[CompleteCoverUpload, Body()],
+) -> Title:
+    """Validate a cover uploaded with a presigned URL and set it on the title."""
+    return await SERVICE.complete_cover_upload(title_id, params)
@@ -0,0 +1,74 @@
+import base64
+import io
+from collections.abc import Sequence
+
+from PIL import Image, ImageFilter, ImageOps
+
+PLACEHOLDER_WIDTH = 16
+
+_CONTENT_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+
+
+def supported_formats(formats: Sequence[str]) -> list[str]:
+    """Keep the variant formats the installed Pillow can encode."""
+    Image.init()
+    return [
+        fmt for fmt in formats if fmt in _CONTENT_TYPES and fmt.upper() in Image.SAVE
+    ]
+
+
+def content_type(fmt: str) -> str:
+    """Get the content type of a variant format."""
+    return _CONTENT_TYPES[fmt]
+
+
+def render_cover(
+    data: bytes,
+    widths: Sequence[int],
+    formats: Sequence[str],
+    quality: int,
+    max_pixels: int,
+) -> tuple[list[tuple[int, str, bytes]], str]:
+    """Render the variants of a cover image.
+
+    Runs in a worker process. The cover is resized to every width not larger
+    than the original (or kept at its own width if it is smaller than all of
+    them) and encoded in every format. Returns the `(width, format, body)` of
+    each variant and a tiny blurred placeholder as a data URI.
+
+    Raises `Image.DecompressionBombError` for covers of more than `max_pixels`
+    pixels, before decoding them.
+    """
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    with Image.open(io.BytesIO(data)) as source:
+        if source.width * source.height > max_pixels:
+            err_msg = f"Cover of {source.width}x{source.height} pixels"
+            raise Image.DecompressionBombError(err_msg)
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+    targets = sorted({width for width in widths if width <= image.width}) or [
+        image.width,
+    ]
+
+    variants: list[tuple[int, str, bytes]] = []
+    for width in targets:
+        resized = _resize(image, width)
+        for fmt in formats:
+            buffer = io.BytesIO()
+            resized.save(buffer, format=fmt.upper(), quality=quality)
+            variants.append((width, fmt, buffer.getvalue()))
+
+    placeholder = _resize(image, PLACEHOLDER_WIDTH).filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    placeholder.save(buffer, format="WEBP", quality=30)
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+
+    return variants, f"data:image/webp;base64,{encoded}"
+
+
+def _resize(image: Image.Image, width: int) -> Image.Image:
+    if width == image.width:
+        return image
+    height = max(round(image.height * width / image.width), 1)
+    return image.resize((width, height), Image.Resampling.LANCZOS)
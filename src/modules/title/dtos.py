@@ -4,8 +4,26 @@ from typing import Annotated
 
 from pydantic import BaseModel, Field
 
+from src._types import SortOrderEnum
 from src.modules.tag.dtos import Tag
-from src.modules.title.enums import TitleContentTypeEnum
+from src.modules.title.enums import (
+    TitleContentTypeEnum,
+    TitleFieldEnum,
+    TitleImportFormatEnum,
+    TitleImportStatusEnum,
+    TitleIncludeEnum,
+    TitleSortEnum,
+)
+from src.settings import Settings
+
+
+class CoverVariant(BaseModel):
+    """Cover variant model."""
+
+    width: int
+    format: str
+    key: str
+    url: str | None = None
 
 
 class Title(BaseModel):
@@ -20,6 +38,62 @@ class Title(BaseModel):
     tags: Sequence[Tag] = []
     content_type: TitleContentTypeEnum
     cover_image: str | None
+    cover_url: str | None = None
+    cover_variants: Sequence[CoverVariant] = []
+    cover_placeholder: str | None = None
+
+
+class PartialTitle(BaseModel):
+    """Title model holding only the requested fields."""
+
+    id: int
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    name: str | None = None
+    description: str | None = None
+    release_date: datetime | None = None
+    tags: Sequence[Tag] | None = None
+    content_type: TitleContentTypeEnum | None = None
+    cover_image: str | None = None
+    cover_url: str | None = None
+    cover_variants: Sequence[CoverVariant] | None = None
+    cover_placeholder: str | None = None
+
+
+class TitleFields(BaseModel):
+    """Title sparse fieldset model.
+
+    No `fields` selects every field and the tags. Otherwise, only the `id`,
+    the selected fields and the `include`d relations are loaded and returned.
+    """
+
+    fields: Sequence[TitleFieldEnum] = []
+    include: Sequence[TitleIncludeEnum] = []
+
+
+class CreateCoverUpload(BaseModel):
+    """Create cover upload model."""
+
+    content_type: Annotated[str, Field(pattern=r"^image/(jpeg|webp|jpg|png|gif)$")]
+    size: Annotated[int, Field(gt=0, le=Settings.COVER_MAX_SIZE)]
+    sha256: Annotated[str, Field(pattern=r"^[0-9a-f]{64}$")]
+
+
+class CoverUpload(BaseModel):
+    """Presigned cover upload model."""
+
+    key: str
+    exists: bool = False
+    url: str | None = None
+    method: str = "PUT"
+    headers: dict[str, str] = {}
+    expires_at: datetime
+
+
+class CompleteCoverUpload(BaseModel):
+    """Complete cover upload model."""
+
+    key: str
 
 
 class CreateTitle(BaseModel):
@@ -41,18 +115,126 @@ class UpdateTitle(BaseModel):
     content_type: TitleContentTypeEnum | None = None
 
 
-class GetTitles(BaseModel):
-    """Get titles model."""
+class ScoredTitle(Title):
+    """Title with a relevance or ranking score."""
+
+    score: float
+
+
+class TitleFilters(BaseModel):
+    """Title tag and content type filters model."""
 
-    name: str | None = None
     include_tags: Sequence[int] = []
     exclude_tags: Sequence[int] = []
     include_content: Sequence[TitleContentTypeEnum] = []
     exclude_content: Sequence[TitleContentTypeEnum] = []
-    limit: int = 10
+
+
+class GetTitles(TitleFilters, TitleFields):
+    """Get titles model."""
+
+    name: str | None = None
+    sort_by: TitleSortEnum = TitleSortEnum.ID
+    order: SortOrderEnum = SortOrderEnum.ASC
+    cursor: str | None = None
+    limit: Annotated[int, Field(ge=1, le=100)] = 10
+    facets: bool = False
+
+
+class SearchTitles(TitleFilters):
+    """Search titles model."""
+
+    query: Annotated[str, Field(min_length=1, max_length=500)]
+    limit: Annotated[int, Field(ge=1, le=100)] = 10
+
+
+class GetRankedTitles(BaseModel):
+    """Get a page of a title ranking model."""
+
+    content_type: TitleContentTypeEnum | None = None
+    offset: Annotated[int, Field(ge=0, le=10_000)] = 0
+    limit: Annotated[int, Field(ge=1, le=100)] = 10
+
+
+class GetSimilarTitles(BaseModel):
+    """Get similar titles model."""
+
+    limit: Annotated[int, Field(ge=1, le=100)] = 10
+
+
+class TitleFacets(BaseModel):
+    """Title counts per tag and content type among the filtered titles.
+
+    `capped` is set when the counts may only cover the first
+    `Settings.TITLE_FACETS_MAX_TITLES` matching titles.
+    """
+
+    total: int
+    tags: dict[int, int]
+    content_types: dict[TitleContentTypeEnum, int]
+    capped: bool = False
+
+
+class TitlePage(BaseModel):
+    """Titles page model."""
+
+    items: Sequence[PartialTitle]
+    next_cursor: str | None = None
+    facets: TitleFacets | None = None
 
 
 class UpdateTitleTags(BaseModel):
     """Update title tags model."""
 
     tags: Sequence[int]
+
+
+class UpdateTitlesTags(BaseModel):
+    """Update the tags of many titles model."""
+
+    titles: Annotated[Sequence[int], Field(min_length=1, max_length=1000)]
+    add: Sequence[int] = []
+    remove: Sequence[int] = []
+
+
+class TitleTagIds(BaseModel):
+    """Title tag IDs model."""
+
+    title_id: int
+    tags: Sequence[int]
+
+
+class TitleIndexStats(BaseModel):
+    """Title tag index statistics model."""
+
+    loaded: bool
+    built_at: datetime | None
+    titles: int
+    tags: int
+    title_tags: int
+    memory_bytes: int
+
+
+class ImportTitles(BaseModel):
+    """Import titles model."""
+
+    format: TitleImportFormatEnum = TitleImportFormatEnum.NDJSON
+
+
+class TitleImportRow(BaseModel):
+    """Title import row report model."""
+
+    line: int
+    status: TitleImportStatusEnum
+    title_id: int | None = None
+    unknown_tags: Sequence[int] = []
+    error: str | None = None
+
+
+class TitleImportReport(BaseModel):
+    """Title import report model."""
+
+    created: int
+    existing: int
+    invalid: int
+    rows: Sequence[TitleImportRow]
@@ -5,3 +5,35 @@ class TitleContentTypeEnum(StrEnum):
     SAFE = "SAFE"
     EROTIC = "EROTIC"
     PORNOGRAPH = "PORNOGRAPH"
+
+
+class TitleSortEnum(StrEnum):
+    ID = "ID"
+    NAME = "NAME"
+    CREATED_AT = "CREATED_AT"
+    UPDATED_AT = "UPDATED_AT"
+
+
+class TitleFieldEnum(StrEnum):
+    NAME = "NAME"
+    DESCRIPTION = "DESCRIPTION"
+    RELEASE_DATE = "RELEASE_DATE"
+    CONTENT_TYPE = "CONTENT_TYPE"
+    COVER = "COVER"
+    CREATED_AT = "CREATED_AT"
+    UPDATED_AT = "UPDATED_AT"
+
+
+class TitleIncludeEnum(StrEnum):
+    TAGS = "TAGS"
+
+
+class TitleImportFormatEnum(StrEnum):
+    NDJSON = "NDJSON"
+    CSV = "CSV"
+
+
+class TitleImportStatusEnum(StrEnum):
+    CREATED = "CREATED"
+    EXISTS = "EXISTS"
+    INVALID = "INVALID"
@@ -0,0 +1,361 @@
+import math
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Self, TypeVar
+
+import numpy as np
+from pyroaring import BitMap
+
+from src._utils import current_datetime
+from src.modules.title.dtos import TitleFilters, TitleIndexStats
+from src.modules.title.enums import TitleContentTypeEnum
+
+_K = TypeVar("_K")
+
+_SIMILARITY_REBUILD_RATIO = 0.01
+_SIMILARITY_MIN_REBUILD_CHANGES = 1000
+_COMMON_TAG_WEIGHT = math.log(10)
+
+
+class _TagVectors:
+    """IDF-weighted tag vectors of titles, for cosine similarity.
+
+    The index bitmaps form the sparse title x tag matrix, and only the tag
+    weights and title norms are kept here. Weights are frozen at build time.
+    Link changes keep the norms up to date with those weights, and the vectors
+    are rebuilt once the changes exceed `_SIMILARITY_REBUILD_RATIO` of the links.
+    """
+
+    def __init__(self, titles: BitMap, tags: dict[int, BitMap]) -> None:
+        size = max(
+            (bitmap.max() for bitmap in (titles, *tags.values()) if bitmap),
+            default=-1,
+        )
+        self.titles = titles
+        self.tags = tags
+        self.weights = {
+            tag_id: math.log(len(titles) / frequency)
+            for tag_id, bitmap in tags.items()
+            if (frequency := bitmap.intersection_cardinality(titles))
+        }
+        self.norms = np.zeros(size + 1)
+        self._dots = np.zeros(size + 1)
+        self.links = 0
+        self.changes = 0
+        for tag_id, weight in self.weights.items():
+            members = _array(tags[tag_id])
+            self.norms[members] += weight**2
+            self.links += len(members)
+
+    @property
+    def stale(self) -> bool:
+        """Whether the tag weights drifted enough to rebuild the vectors."""
+        return self.changes > max(
+            _SIMILARITY_MIN_REBUILD_CHANGES,
+            self.links * _SIMILARITY_REBUILD_RATIO,
+        )
+
+    def link(self, title_id: int, tag_id: int, delta: int) -> None:
+        """Add (`delta=1`) or remove (`delta=-1`) a tag from a title vector."""
+        if title_id >= len(self.norms):
+            norms = np.zeros(max(title_id + 1, len(self.norms) * 2))
+            norms[: len(self.norms)] = self.norms
+            self.norms = norms
+            self._dots = np.zeros(len(norms))
+        self.norms[title_id] += delta * self.weights.get(tag_id, 0) ** 2
+        self.changes += 1
+
+    def similar(self, title_id: int, limit: int) -> list[tuple[int, float]]:
+        """Get the active titles with the highest cosine similarity to a title.
+
+        Candidates are first the titles sharing a tag held by less than a tenth
+        of the titles. By Cauchy-Schwarz, a title sharing only common tags
+        scores at most the norm of those tags over the title norm, so the
+        result is exact when the last candidate kept scores at least that much.
+        Otherwise, every title sharing a tag is scored.
+        """
+        title_tags = {
+            tag_id: self.weights[tag_id]
+            for tag_id, bitmap in self.tags.items()
+            if tag_id in self.weights and title_id in bitmap
+        }
+        norm = math.sqrt(sum(weight**2 for weight in title_tags.values()))
+        if not norm:
+            return []
+
+        rare = [tag_id for tag_id, w in title_tags.items() if w >= _COMMON_TAG_WEIGHT]
+        if rare:
+            result = self._score(title_id, title_tags, norm, rare, limit=limit)
+            common = math.sqrt(
+                sum(w**2 for w in title_tags.values() if w < _COMMON_TAG_WEIGHT),
+            )
+            if len(result) == limit and result[-1][1] >= common / norm:
+                return result
+
+        return self._score(title_id, title_tags, norm, title_tags, limit=limit)
+
+    def _score(
+        self,
+        title_id: int,
+        title_tags: dict[int, float],
+        norm: float,
+        candidate_tags: Iterable[int],
+        *,
+        limit: int,
+    ) -> list[tuple[int, float]]:
+        """Score the active titles sharing any of `candidate_tags`."""
+        candidates = BitMap.union(*(self.tags[tag_id] for tag_id in candidate_tags))
+        candidates &= self.titles
+        candidates.discard(title_id)
+        if not candidates:
+            return []
+
+        ids = _array(candidates)
+        for tag_id, weight in title_tags.items():
+            self._dots[_array(self.tags[tag_id] & candidates)] += weight**2
+        scores = self._dots[ids]
+        self._dots[ids] = 0
+
+        norms = np.sqrt(np.maximum(self.norms[ids], 0)) * norm
+        np.divide(scores, norms, out=scores, where=norms > 0)
+
+        limit = min(limit, len(ids))
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        best = best[np.lexsort((ids[best], -scores[best]))]
+        return [
+            (int(ids[position]), float(scores[position]))
+            for position in best
+            if scores[position] > 0
+        ]
+
+
+def _array(bitmap: BitMap) -> np.ndarray:
+    return np.frombuffer(bitmap.to_array(), dtype=np.uint32).astype(np.intp)
+
+
+class TitleTagIndex:
+    """In-memory compressed bitmap index of active titles.
+
+    Holds one roaring bitmap of title IDs per tag and per content type, so tag
+    and content type filters are evaluated with set operations instead of
+    correlated `EXISTS` subqueries. Tag bits of deactivated titles are left in
+    place and masked out by the bitmap of active titles.
+
+    Changes made by this worker are applied as they happen, and `update`
+    applies those of the other workers, read from the database since `cursor`.
+    """
+
+    __instance: Self | None = None
+
+    cursor: datetime | None
+    _titles: BitMap
+    _tags: dict[int, BitMap]
+    _contents: dict[TitleContentTypeEnum, BitMap]
+    _built_at: datetime | None
+    _vectors: _TagVectors | None
+
+    def __new__(cls) -> Self:
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.clear()
+        return cls.__instance
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the index was built from the database."""
+        return self._built_at is not None
+
+    def clear(self) -> None:
+        """Empty the index and mark it as not loaded."""
+        self.cursor = None
+        self._titles = BitMap()
+        self._tags = {}
+        self._contents = {}
+        self._built_at = None
+        self._vectors = None
+
+    def load(
+        self,
+        titles: Iterable[tuple[int, TitleContentTypeEnum]],
+        title_tags: Iterable[tuple[int, int]],
+        *,
+        cursor: datetime | None,
+    ) -> None:
+        """Replace the index content with the given rows."""
+        active: list[int] = []
+        contents: dict[TitleContentTypeEnum, list[int]] = {}
+        for title_id, content_type in titles:
+            active.append(title_id)
+            contents.setdefault(content_type, []).append(title_id)
+
+        tags: dict[int, list[int]] = {}
+        for title_id, tag_id in title_tags:
+            tags.setdefault(tag_id, []).append(title_id)
+
+        self._titles = BitMap(active)
+        self._contents = {key: BitMap(ids) for key, ids in contents.items()}
+        self._tags = {key: BitMap(ids) for key, ids in tags.items()}
+        self.cursor = cursor
+        self._built_at = current_datetime()
+        self._vectors = None
+
+    def update(
+        self,
+        titles: Iterable[tuple[int, TitleContentTypeEnum, bool, Iterable[int]]],
+        *,
+        cursor: datetime | None,
+    ) -> None:
+        """Replace the given titles in the index. Inactive titles are removed.
+
+        Titles are `(title_id, content_type, is_active, tag_ids)`. Their current
+        tags are found with one bitmap intersection per tag.
+        """
+        titles = list(titles)
+        changed = BitMap(title_id for title_id, *_ in titles)
+        current: dict[int, set[int]] = {}
+        for tag_id, bitmap in self._tags.items():
+            for title_id in bitmap & changed:
+                current.setdefault(title_id, set()).add(tag_id)
+
+        for title_id, content_type, is_active, tag_ids in titles:
+            if not is_active:
+                self.remove_title(title_id)
+                continue
+            tags = set(tag_ids)
+            self.remove_tags(title_id, current.get(title_id, set()) - tags)
+            self.add_title(title_id, content_type, tags)
+
+        self.cursor = max(filter(None, (self.cursor, cursor)), default=None)
+
+    def add_title(
+        self,
+        title_id: int,
+        content_type: TitleContentTypeEnum,
+        tag_ids: Iterable[int],
+    ) -> None:
+        """Add an active title to the index."""
+        self._titles.add(title_id)
+        self.set_content_type(title_id, content_type)
+        self.add_tags(title_id, tag_ids)
+
+    def remove_title(self, title_id: int) -> None:
+        """Remove a title from the active titles."""
+        self._titles.discard(title_id)
+
+    def set_content_type(
+        self,
+        title_id: int,
+        content_type: TitleContentTypeEnum,
+    ) -> None:
+        """Move a title to another content type."""
+        for bitmap in self._contents.values():
+            bitmap.discard(title_id)
+        self._contents.setdefault(content_type, BitMap()).add(title_id)
+
+    def add_tags(self, title_id: int, tag_ids: Iterable[int]) -> None:
+        """Add tags to a title."""
+        for tag_id in tag_ids:
+            bitmap = self._tags.setdefault(tag_id, BitMap())
+            if title_id not in bitmap:
+                bitmap.add(title_id)
+                if self._vectors is not None:
+                    self._vectors.link(title_id, tag_id, 1)
+
+    def remove_tags(self, title_id: int, tag_ids: Iterable[int]) -> None:
+        """Remove tags from a title."""
+        for tag_id in tag_ids:
+            if (bitmap := self._tags.get(tag_id)) and title_id in bitmap:
+                bitmap.discard(title_id)
+                if self._vectors is not None:
+                    self._vectors.link(title_id, tag_id, -1)
+
+    def candidates(self, params: TitleFilters) -> BitMap | None:
+        """Get the IDs of the active titles matching the filters.
+
+        Returns `None` when the index is not loaded or there is nothing to filter.
+        """
+        if not self.loaded or not (
+            params.include_tags
+            or params.exclude_tags
+            or params.include_content
+            or params.exclude_content
+        ):
+            return None
+
+        result = self._titles
+        if params.include_content:
+            result = result & self._union(self._contents, params.include_content)
+        if params.exclude_content:
+            result = result - self._union(self._contents, params.exclude_content)
+        if params.include_tags:
+            result = result & self._union(self._tags, params.include_tags)
+        if params.exclude_tags:
+            result = result - self._union(self._tags, params.exclude_tags)
+        return result
+
+    def facets(
+        self,
+        params: TitleFilters,
+    ) -> tuple[int, dict[int, int], dict[TitleContentTypeEnum, int]] | None:
+        """Count the active titles matching the filters, per tag and content type.
+
+        Returns the total and the non-zero counts, or `None` when the index is
+        not loaded. Every count is the cardinality of a bitmap intersection.
+        """
+        if not self.loaded:
+            return None
+
+        result = self.candidates(params)
+        if result is None:
+            result = self._titles
+
+        return (
+            len(result),
+            {
+                tag_id: count
+                for tag_id, bitmap in self._tags.items()
+                if (count := bitmap.intersection_cardinality(result))
+            },
+            {
+                content_type: count
+                for content_type, bitmap in self._contents.items()
+                if (count := bitmap.intersection_cardinality(result))
+            },
+        )
+
+    def similar(self, title_id: int, limit: int) -> list[tuple[int, float]]:
+        """Get the `(title_id, score)` of the titles sharing the most rare tags.
+
+        Titles are scored by the cosine similarity of their IDF-weighted tag
+        vectors, computed with array operations over the tag bitmaps.
+        """
+        if not self.loaded:
+            return []
+        if self._vectors is None or self._vectors.stale:
+            self._vectors = _TagVectors(self._titles, self._tags)
+        return self._vectors.similar(title_id, limit)
+
+    def stats(self) -> TitleIndexStats:
+        """Get the index size and memory usage."""
+        bitmaps = [self._titles, *self._contents.values(), *self._tags.values()]
+        memory = 0
+        for bitmap in bitmaps:
+            statistics = bitmap.get_statistics()
+            memory += (
+                statistics["n_bytes_array_containers"]
+                + statistics["n_bytes_run_containers"]
+                + statistics["n_bytes_bitset_containers"]
+            )
+
+        return TitleIndexStats(
+            loaded=self.loaded,
+            built_at=self._built_at,
+            titles=len(self._titles),
+            tags=len(self._tags),
+            title_tags=sum(len(bitmap) for bitmap in self._tags.values()),
+            memory_bytes=memory,
+        )
+
+    @staticmethod
+    def _union(bitmaps: dict[_K, BitMap], keys: Iterable[_K]) -> BitMap:
+        return BitMap.union(BitMap(), *(bitmaps[key] for key in keys if key in bitmaps))
@@ -0,0 +1,207 @@
+import bisect
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Self
+
+from src._utils import current_datetime
+from src.modules.title.enums import TitleContentTypeEnum
+from src.settings import Settings
+
+
+class _SortedScores:
+    """Title scores kept sorted from best to worst."""
+
+    def __init__(self, scores: dict[int, float] | None = None) -> None:
+        self._scores: dict[int, float] = scores or {}
+        self._order: list[tuple[float, int]] = sorted(
+            (-score, title_id) for title_id, score in self._scores.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def get(self, title_id: int) -> float | None:
+        """Get the score of a title, if present."""
+        return self._scores.get(title_id)
+
+    def set(self, title_id: int, score: float) -> None:
+        """Set the score of a title."""
+        self.discard(title_id)
+        self._scores[title_id] = score
+        bisect.insort(self._order, (-score, title_id))
+
+    def discard(self, title_id: int) -> None:
+        """Remove a title, if present."""
+        score = self._scores.pop(title_id, None)
+        if score is not None:
+            del self._order[bisect.bisect_left(self._order, (-score, title_id))]
+
+    def top(self, offset: int, limit: int) -> list[tuple[int, float]]:
+        """Get the `(title_id, score)` of a slice of the best titles."""
+        return [
+            (title_id, -score)
+            for score, title_id in self._order[offset : offset + limit]
+        ]
+
+
+class TitleRanking:
+    """In-memory rankings of the rated active titles.
+
+    Holds, for every content type and for all titles together, the titles
+    sorted by their top-rated score and by their trending score, so a page of
+    either ranking is a slice of a sorted list.
+
+    The top-rated score is the Bayesian average of the ratings of a title,
+    pulled towards the mean rating of all titles by
+    `Settings.TITLE_TOP_PRIOR_WEIGHT` virtual ratings. The trending score counts
+    the ratings given to a title, each weighing half as much every
+    `Settings.TITLE_TRENDING_HALF_LIFE` seconds since it was given. Trending
+    scores are kept relative to `epoch`: every score decays at the same pace,
+    so the order never changes over time.
+    """
+
+    __instance: Self | None = None
+
+    mean: float
+    epoch: datetime
+    cursor: datetime | None
+    _content_types: dict[int, TitleContentTypeEnum]
+    _top: dict[TitleContentTypeEnum | None, _SortedScores]
+    _trending: dict[TitleContentTypeEnum | None, _SortedScores]
+    _built_at: datetime | None
+
+    def __new__(cls) -> Self:
+        if cls.__instance is None:
+            cls.__instance = super().__new__(cls)
+            cls.__instance.clear()
+        return cls.__instance
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the rankings were built from the database."""
+        return self._built_at is not None
+
+    def clear(self) -> None:
+        """Empty the rankings and mark them as not loaded."""
+        self.mean = 0
+        self.epoch = current_datetime()
+        self.cursor = None
+        self._content_types = {}
+        self._top = {}
+        self._trending = {}
+        self._built_at = None
+
+    def load(
+        self,
+        rows: Iterable[tuple[int, TitleContentTypeEnum, int, float, float]],
+        *,
+        mean: float,
+        epoch: datetime,
+        cursor: datetime | None,
+    ) -> None:
+        """Replace the rankings with the given rows.
+
+        Rows are `(title_id, content_type, count, total, trending)`, where
+        `trending` is relative to `epoch`. Each title appears once, and every
+        ranking is sorted once.
+        """
+        self.clear()
+        self.mean = mean
+        self.epoch = epoch
+
+        top: dict[TitleContentTypeEnum | None, dict[int, float]] = {}
+        trending: dict[TitleContentTypeEnum | None, dict[int, float]] = {}
+        for title_id, content_type, count, total, trending_score in rows:
+            if count <= 0:
+                continue
+
+            self._content_types[title_id] = content_type
+            for key in (None, content_type):
+                top.setdefault(key, {})[title_id] = self._top_score(count, total)
+                trending.setdefault(key, {})[title_id] = trending_score
+
+        self._top = {key: _SortedScores(scores) for key, scores in top.items()}
+        self._trending = {
+            key: _SortedScores(scores) for key, scores in trending.items()
+        }
+        self.cursor = cursor
+        self._built_at = current_datetime()
+
+    def update(
+        self,
+        rows: Iterable[tuple[int, TitleContentTypeEnum, int, float, float]],
+        *,
+        cursor: datetime | None,
+    ) -> None:
+        """Set the scores of the given titles. Titles without ratings are removed."""
+        for title_id, content_type, count, total, trending in rows:
+            if count <= 0:
+                self.remove_title(title_id)
+                continue
+
+            if self._content_types.get(title_id) != content_type:
+                self.remove_title(title_id)
+                self._content_types[title_id] = content_type
+
+            score = self._top_score(count, total)
+            for key in (None, content_type):
+                self._top.setdefault(key, _SortedScores()).set(title_id, score)
+                self._trending.setdefault(key, _SortedScores()).set(title_id, trending)
+
+        self.cursor = max(filter(None, (self.cursor, cursor)), default=None)
+
+    def _top_score(self, count: int, total: float) -> float:
+        weight = Settings.TITLE_TOP_PRIOR_WEIGHT
+        return (weight * self.mean + total) / (weight + count)
+
+    def set_content_type(
+        self,
+        title_id: int,
+        content_type: TitleContentTypeEnum,
+    ) -> None:
+        """Move a ranked title to another content type."""
+        previous = self._content_types.get(title_id)
+        if previous is None or previous == content_type:
+            return
+
+        self._content_types[title_id] = content_type
+        for rankings in (self._top, self._trending):
+            score = rankings[previous].get(title_id)
+            rankings[previous].discard(title_id)
+            if score is not None:
+                rankings.setdefault(content_type, _SortedScores()).set(title_id, score)
+
+    def remove_title(self, title_id: int) -> None:
+        """Remove a title from the rankings."""
+        content_type = self._content_types.pop(title_id, None)
+        for key in (None, content_type):
+            for rankings in (self._top, self._trending):
+                if scores := rankings.get(key):
+                    scores.discard(title_id)
+
+    def top(
+        self,
+        content_type: TitleContentTypeEnum | None,
+        offset: int,
+        limit: int,
+    ) -> list[tuple[int, float]]:
+        """Get a page of the top-rated titles, with their Bayesian average."""
+        scores = self._top.get(content_type)
+        return scores.top(offset, limit) if scores else []
+
+    def trending(
+        self,
+        content_type: TitleContentTypeEnum | None,
+        offset: int,
+        limit: int,
+    ) -> list[tuple[int, float]]:
+        """Get a page of the trending titles, with their score as of now."""
+        scores = self._trending.get(content_type)
+        if not scores:
+            return []
+
+        elapsed = (current_datetime() - self.epoch).total_seconds()
+        decay = 2 ** (-elapsed / Settings.TITLE_TRENDING_HALF_LIFE)
+        return [
+            (title_id, score * decay) for title_id, score in scores.top(offset, limit)
+        ]
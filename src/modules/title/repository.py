@@ -1,22 +1,127 @@
-from collections.abc import Sequence
-from typing import TYPE_CHECKING, Self
+from collections import Counter
+from collections.abc import (
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Collection,
+    Iterable,
+    Mapping,
+    Sequence,
+)
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Self, TypeVar
 
-from sqlalchemy import delete, func, select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    any_,
+    case,
+    delete,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, array, insert
+from sqlalchemy.orm import (
+    InstrumentedAttribute,
+    joinedload,
+    load_only,
+    selectinload,
+)
+from sqlalchemy.schema import CreateTable
 
-from src.modules._rating_dto import Rating
+from src._types import SortOrderEnum
+from src._utils import current_datetime
+from src.core.contexts.cache import CacheContext
+from src.core.pagination import Cursor
+from src.exceptions.bad_request import InvalidCursorError
+from src.modules._rating_dto import Rating, TargetRating
 from src.modules.base.repository import BaseRepository
+from src.modules.tag.repository import TagRepository
 from src.modules.tag.table import TagTable
-from src.modules.title.dtos import CreateTitle, GetTitles, UpdateTitle
-from src.modules.title.table import TitleRatingTable, TitleTable
+from src.modules.title.dtos import (
+    CoverVariant,
+    CreateTitle,
+    GetTitles,
+    SearchTitles,
+    Title,
+    TitleFacets,
+    TitleFilters,
+    TitleIndexStats,
+    UpdateTitle,
+)
+from src.modules.title.enums import TitleContentTypeEnum, TitleSortEnum
+from src.modules.title.index import TitleTagIndex
+from src.modules.title.ranking import TitleRanking
+from src.modules.title.table import (
+    RATING_BUCKETS,
+    CoverBlobTable,
+    TitleRatingSummaryTable,
+    TitleRatingTable,
+    TitleTable,
+    TitleTagTable,
+)
+from src.settings import Settings
 
 if TYPE_CHECKING:
+    from pyroaring import BitMap
+    from sqlalchemy import BindParameter, Select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
     from src.modules._rating_dto import CreateRating
 
+_T = TypeVar("_T", bound=tuple[Any, ...])
+
+_RECONCILE_RATINGS_LOCK = 0x7469746C655F7231
+
+_RECONCILE_TAG_USAGE_LOCK = 0x7469746C655F7432
+
+_RANKING_REFRESH_OVERLAP = timedelta(seconds=60)
+_INDEX_REFRESH_OVERLAP = timedelta(seconds=60)
+
+_TRENDING_HALF_LIVES = 10
+
+_IMPORT_STAGING = Table(
+    "title_import",
+    MetaData(),
+    Column("line", Integer, primary_key=True),
+    Column("name", String),
+    Column("description", String),
+    Column("release_date", DateTime(timezone=True)),
+    Column("content_type", String),
+    Column("tags", ARRAY(Integer)),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+def _ids(values: Iterable[int]) -> "BindParameter[list[int]]":
+    """Bind IDs as a single integer array parameter."""
+    return literal(list(values), ARRAY(Integer))
+
+
+_SORT_KEYS: dict[TitleSortEnum, tuple[InstrumentedAttribute[Any], ...]] = {
+    TitleSortEnum.ID: (TitleTable.id,),
+    TitleSortEnum.NAME: (TitleTable.name, TitleTable.id),
+    TitleSortEnum.CREATED_AT: (TitleTable.created_at, TitleTable.id),
+    TitleSortEnum.UPDATED_AT: (TitleTable.updated_at, TitleTable.id),
+}
+
 
 class TitleRepository(BaseRepository):
     __instance: Self | None = None
 
+    index = TitleTagIndex()
+    ranking = TitleRanking()
+
     def __new__(cls) -> Self:
         if cls.__instance is None:
             cls.__instance = super().__new__(cls)
@@ -30,15 +135,266 @@ class TitleRepository(BaseRepository):
         )
         return (await self._execute_query(query)).first()
 
-    async def get_titles(self, params: GetTitles) -> Sequence[TitleTable]:
-        """Get all titles."""
+    async def get_titles_by_ids(self, title_ids: Sequence[int]) -> list[TitleTable]:
+        """Get active titles by ID, in the order of `title_ids`."""
         query = (
-            select(TitleTable).options(joinedload(TitleTable.tags)).limit(params.limit)
+            select(TitleTable)
+            .where(TitleTable.id == any_(_ids(title_ids)), TitleTable.is_active)
+            .options(selectinload(TitleTable.tags))
+        )
+        titles = {title.id: title for title in await self._execute_query(query)}
+        return [titles[title_id] for title_id in title_ids if title_id in titles]
+
+    async def get_cached_title(self, title_id: int) -> Title | None:
+        """Get a title by ID, read through the title cache.
+
+        The cache key carries the title `updated_at`, read first with a primary
+        key lookup, so a title changed by any worker is never served stale, and
+        the body always matches the version from `get_title_version`.
+        """
+        updated_at = await self._get_updated_at(title_id)
+        if updated_at is None:
+            return None
+
+        cache = CacheContext.get_cache()
+        if (
+            cached := await cache.get(self._cache_key(title_id, updated_at))
+        ) is not None:
+            return Title.model_validate_json(cached)
+
+        title = await self.get_title(id=title_id)
+        if title is None:
+            return None
+
+        dto = Title(**title.model_dump())
+        await cache.set(
+            self._cache_key(title_id, dto.updated_at),
+            dto.model_dump_json().encode(),
+            Settings.CACHE_TTL,
         )
+        return dto
+
+    @staticmethod
+    def _cache_key(title_id: int, updated_at: datetime) -> str:
+        """Get the cache key of a title version.
+
+        Titles embed their tags, so the key carries the tag version: any tag
+        change retires every cached title at once. Retired keys expire after
+        `Settings.CACHE_TTL`.
+        """
+        return f"title:{TagRepository().version}:{title_id}:{updated_at.isoformat()}"
+
+    async def _get_updated_at(self, title_id: int) -> datetime | None:
+        query = select(TitleTable.updated_at).where(TitleTable.id == title_id)
+        return (await self._execute_query(query)).first()
+
+    async def get_title_version(self, title_id: int) -> str | None:
+        """Get the version of a title, covering the title and its tags."""
+        updated_at = await self._get_updated_at(title_id)
+        if updated_at is None:
+            return None
+        return f"{updated_at}|{TagRepository().version}"
+
+    async def get_titles(
+        self,
+        params: GetTitles,
+        *,
+        attributes: Collection[str] | None = None,
+        with_tags: bool = True,
+    ) -> tuple[Sequence[TitleTable], str | None]:
+        """Get a page of titles and the cursor of the next page.
+
+        Titles are paginated by keyset on `(sort key, id)`, so every page costs
+        an index range scan regardless of its depth. Tags are loaded in a
+        separate query, so the limit counts titles and not joined rows.
+
+        Only the given column `attributes` (plus the ID and sort keys) are
+        selected, if any, and tags are only loaded `with_tags`.
+
+        When sorted by ID, the filters are resolved to the candidate IDs of the
+        page from the title tag index. If some of them are no longer active
+        titles, the index is stale and the page is filtered in SQL instead.
+        """
+        keys = _SORT_KEYS[params.sort_by]
+        descending = params.order == SortOrderEnum.DESC
+
+        query = (
+            select(TitleTable)
+            .where(TitleTable.is_active)
+            .order_by(*(key.desc() if descending else key.asc() for key in keys))
+            .limit(params.limit + 1)
+        )
+        if attributes is not None:
+            query = query.options(
+                load_only(
+                    TitleTable.id,
+                    *keys,
+                    *(getattr(TitleTable, attribute) for attribute in attributes),
+                ),
+            )
+        if with_tags:
+            query = query.options(selectinload(TitleTable.tags))
+
+        values = None
+        if params.cursor:
+            values = self._decode_cursor(params.cursor, params.sort_by, keys)
+            row = tuple_(*keys)
+            bound = tuple_(*values, types=[key.type for key in keys])
+            query = query.where(row < bound if descending else row > bound)
 
         if params.name:
             query = query.filter(TitleTable.name.ilike(f"%{params.name}%"))
 
+        candidates = self.index.candidates(params)
+        titles = None
+        if (
+            candidates is not None
+            and params.sort_by == TitleSortEnum.ID
+            and not params.name
+        ):
+            page = self._page_candidates(
+                candidates,
+                after=values[0] if values else None,
+                size=params.limit + 1,
+                descending=descending,
+            )
+            titles = (
+                await self._execute_query(self._filter(query, params, page))
+            ).all()
+            if len(titles) < len(page):
+                # The index is behind the database, so filter in SQL instead.
+                titles = candidates = None
+
+        if titles is None:
+            titles = (
+                await self._execute_query(self._filter(query, params, candidates))
+            ).all()
+
+        if len(titles) <= params.limit:
+            return titles, None
+
+        titles = titles[: params.limit]
+        next_cursor = Cursor.encode(
+            params.sort_by,
+            *(getattr(titles[-1], key.key) for key in keys),
+        )
+        return titles, next_cursor
+
+    async def get_title_facets(self, params: GetTitles) -> TitleFacets:
+        """Count the titles matching the filters, per tag and content type.
+
+        Counts come from the title tag index when it can resolve the filters.
+        Otherwise, a single `GROUPING SETS` query counts the first
+        `Settings.TITLE_FACETS_MAX_TITLES` matching titles.
+        """
+        if not params.name and (facets := self.index.facets(params)) is not None:
+            total, tags, content_types = facets
+            return TitleFacets(
+                total=total,
+                tags=tags,
+                content_types=content_types,
+                capped=False,
+            )
+
+        max_titles = Settings.TITLE_FACETS_MAX_TITLES
+        query = select(TitleTable.id, TitleTable.content_type).where(
+            TitleTable.is_active,
+        )
+        if params.name:
+            query = query.filter(TitleTable.name.ilike(f"%{params.name}%"))
+        titles = (
+            self._filter(query, params, self.index.candidates(params))
+            .limit(max_titles)
+            .subquery()
+        )
+
+        grouped = (
+            select(
+                func.grouping(TitleTagTable.tag_id),
+                TitleTagTable.tag_id,
+                titles.c.content_type,
+                func.count(func.distinct(titles.c.id)),
+            )
+            .select_from(titles)
+            .outerjoin(TitleTagTable, TitleTagTable.title_id == titles.c.id)
+            .group_by(
+                func.grouping_sets(TitleTagTable.tag_id, titles.c.content_type),
+            )
+        )
+
+        tags: dict[int, int] = {}
+        content_types: dict[TitleContentTypeEnum, int] = {}
+        async with self._session() as session:
+            for by_content, tag_id, content_type, count in (
+                await session.execute(grouped)
+            ).tuples():
+                if by_content:
+                    content_types[content_type] = count
+                elif tag_id is not None:
+                    tags[tag_id] = count
+
+        total = sum(content_types.values())
+        return TitleFacets(
+            total=total,
+            tags=tags,
+            content_types=content_types,
+            capped=total >= max_titles,
+        )
+
+    async def search_titles(
+        self,
+        params: SearchTitles,
+    ) -> Sequence[tuple[TitleTable, float]]:
+        """Search titles by full-text and trigram similarity, ranked by relevance.
+
+        Full-text matches use the GIN-indexed `search_vector`, while fuzzy and
+        substring matches on the name use the trigram index.
+        """
+        ts_query = func.websearch_to_tsquery("simple", params.query)
+        score = (
+            func.ts_rank_cd(TitleTable.search_vector, ts_query)
+            + func.similarity(TitleTable.name, params.query)
+        ).label("score")
+
+        query = (
+            select(TitleTable, score)
+            .where(
+                TitleTable.is_active,
+                or_(
+                    TitleTable.search_vector.bool_op("@@")(ts_query),
+                    TitleTable.name.bool_op("%")(params.query),
+                    TitleTable.name.ilike(f"%{params.query}%"),
+                ),
+            )
+            .options(selectinload(TitleTable.tags))
+            .order_by(score.desc(), TitleTable.id)
+            .limit(params.limit)
+        )
+
+        async with self._session() as session:
+            query = self._filter(query, params, self.index.candidates(params))
+            result = await session.execute(query)
+            return [(title, float(rank)) for title, rank in result.tuples()]
+
+    @staticmethod
+    def _filter(
+        query: "Select[_T]",
+        params: TitleFilters,
+        candidates: "BitMap | None",
+    ) -> "Select[_T]":
+        """Apply the tag and content type filters to a titles query.
+
+        When the title tag index resolved the filters to a small enough set of
+        candidate IDs, the database only receives that set as a single array.
+        """
+        if (
+            candidates is not None
+            and len(candidates) <= Settings.TITLE_INDEX_MAX_CANDIDATES
+        ):
+            return query.where(
+                TitleTable.id == any_(_ids(candidates)),
+            )
+
         if params.include_content:
             query = query.filter(TitleTable.content_type.in_(params.include_content))
 
@@ -55,40 +411,424 @@ class TitleRepository(BaseRepository):
                 ~TitleTable.tags.any(TagTable.id.in_(params.exclude_tags)),
             )
 
-        return (await self._execute_query(query)).unique().all()
+        return query
+
+    @staticmethod
+    def _page_candidates(
+        candidates: "BitMap",
+        *,
+        after: int | None,
+        size: int,
+        descending: bool,
+    ) -> "BitMap":
+        """Narrow ID-sorted candidates down to the IDs of a single page."""
+        if descending:
+            end = len(candidates) if after is None else candidates.rank(after - 1)
+            return candidates[max(end - size, 0) : end]
+
+        start = 0 if after is None else candidates.rank(after)
+        return candidates[start : start + size]
+
+    @staticmethod
+    def _decode_cursor(
+        cursor: str,
+        sort_by: TitleSortEnum,
+        keys: tuple[InstrumentedAttribute[Any], ...],
+    ) -> list[Any]:
+        """Decode a titles cursor into values typed after the sort keys."""
+        values = Cursor.decode(cursor, sort_by, len(keys))
+        try:
+            return [
+                datetime.fromisoformat(value)
+                if key.type.python_type is datetime
+                else key.type.python_type(value)
+                for key, value in zip(keys, values, strict=True)
+            ]
+        except (TypeError, ValueError):
+            raise InvalidCursorError(cursor=cursor) from None
 
     async def create_title(
         self,
         params: CreateTitle,
-        tags: Sequence["TagTable"],
+        tag_ids: Sequence[int],
     ) -> TitleTable:
-        return await self._save(
-            TitleTable(**params.model_dump(exclude={"tags"}), tags=tags),
-        )
+        """Create a title linked to the given tags."""
+        async with self._session() as session:
+            title = TitleTable(**params.model_dump(exclude={"tags"}))
+            session.add(title)
+            await session.flush()
+            if tag_ids:
+                await session.execute(
+                    insert(TitleTagTable),
+                    [{"title_id": title.id, "tag_id": tag_id} for tag_id in tag_ids],
+                )
+                await self._add_tag_usage(session, dict.fromkeys(tag_ids, 1))
+            await session.commit()
+            await session.refresh(title)
+        self.index.add_title(title.id, title.content_type, tag_ids)
+        return title
+
+    async def import_titles(
+        self,
+        rows: AsyncIterable[tuple[int, CreateTitle]],
+    ) -> Sequence[tuple[int, int, bool, list[int]]]:
+        """Bulk create titles and their tags.
+
+        Rows are streamed with `COPY` into a temporary staging table and merged
+        set-based: the first row of each name is inserted unless a title with
+        that name already exists, then the tags of the new titles are linked in
+        a single statement. Unknown tag IDs are not linked.
+
+        Returns the `(line, title id, created, unknown tag IDs)` of every
+        staged row.
+        """
+        staging = _IMPORT_STAGING.c
+        now = current_datetime()
+
+        async with self._session() as session:
+            connection = await session.connection()
+            await connection.execute(CreateTable(_IMPORT_STAGING))
+
+            driver = (await connection.get_raw_connection()).driver_connection
+            columns = ", ".join(column.name for column in _IMPORT_STAGING.columns)
+            async with (
+                driver.cursor() as cursor,
+                cursor.copy(f"COPY title_import ({columns}) FROM STDIN") as copy,
+            ):
+                async for line, row in rows:
+                    await copy.write_row(
+                        (
+                            line,
+                            row.name,
+                            row.description,
+                            row.release_date,
+                            row.content_type,
+                            list(row.tags),
+                        ),
+                    )
+
+            first = (
+                select(_IMPORT_STAGING)
+                .distinct(staging.name)
+                .order_by(staging.name, staging.line)
+                .cte("first")
+            )
+            titles = await session.execute(
+                insert(TitleTable)
+                .from_select(
+                    [
+                        "name",
+                        "description",
+                        "release_date",
+                        "content_type",
+                        "created_at",
+                        "updated_at",
+                        "is_active",
+                    ],
+                    select(
+                        first.c.name,
+                        first.c.description,
+                        first.c.release_date,
+                        first.c.content_type,
+                        literal(now),
+                        literal(now),
+                        true(),
+                    ),
+                )
+                .on_conflict_do_nothing(index_elements=[TitleTable.name])
+                .returning(TitleTable.id, TitleTable.content_type),
+            )
+            created = dict(titles.tuples().all())
+            created_ids = _ids(created)
+
+            tagged = select(
+                first.c.name,
+                func.unnest(first.c.tags).label("tag_id"),
+            ).subquery()
+            title_tags = await session.execute(
+                insert(TitleTagTable)
+                .from_select(
+                    ["title_id", "tag_id"],
+                    select(TitleTable.id, TagTable.id)
+                    .join(tagged, tagged.c.name == TitleTable.name)
+                    .join(TagTable, TagTable.id == tagged.c.tag_id)
+                    .where(TitleTable.id == any_(created_ids)),
+                )
+                .on_conflict_do_nothing()
+                .returning(TitleTagTable.title_id, TitleTagTable.tag_id),
+            )
+            tags: dict[int, list[int]] = {}
+            usage: Counter[int] = Counter()
+            for title_id, tag_id in title_tags.tuples():
+                tags.setdefault(title_id, []).append(tag_id)
+                usage[tag_id] += 1
+            await self._add_tag_usage(session, usage)
+
+            unknown = set(
+                await session.scalars(
+                    select(func.unnest(staging.tags)).except_(select(TagTable.id)),
+                ),
+            )
+            report = await session.execute(
+                select(
+                    staging.line,
+                    TitleTable.id,
+                    (TitleTable.id == any_(created_ids))
+                    & staging.line.in_(select(first.c.line)),
+                    staging.tags,
+                )
+                .join(TitleTable, TitleTable.name == staging.name)
+                .order_by(staging.line),
+            )
+            rows_report = [
+                (line, title_id, is_created, sorted(unknown.intersection(row_tags)))
+                for line, title_id, is_created, row_tags in report.tuples()
+            ]
+            await session.commit()
+
+        for title_id, content_type in created.items():
+            self.index.add_title(
+                title_id,
+                TitleContentTypeEnum(content_type),
+                tags.get(title_id, []),
+            )
+        return rows_report
 
     async def update_title(self, title: TitleTable, params: UpdateTitle) -> TitleTable:
         title.update(params)
-        return await self._save(title)
+        title = await self._save(title)
+        if params.content_type:
+            self.index.set_content_type(title.id, title.content_type)
+            self.ranking.set_content_type(title.id, title.content_type)
+        return title
 
     async def delete_title(self, title: TitleTable) -> None:
+        """Deactivate a title, and stop counting it in the usage of its tags."""
+        async with self._session() as session:
+            deactivated = await session.execute(
+                update(TitleTable)
+                .where(TitleTable.id == title.id, TitleTable.is_active)
+                .values(is_active=False, updated_at=current_datetime())
+                .returning(TitleTable.updated_at),
+            )
+            if (updated_at := deactivated.scalar()) is not None:
+                tag_ids = await session.scalars(
+                    select(TitleTagTable.tag_id).where(
+                        TitleTagTable.title_id == title.id,
+                    ),
+                )
+                await self._add_tag_usage(session, dict.fromkeys(tag_ids, -1))
+                title.updated_at = updated_at
+            await session.commit()
         title.is_active = False
-        await self._save(title)
+        self.index.remove_title(title.id)
+        self.ranking.remove_title(title.id)
 
     async def add_tags(
         self,
-        title: TitleTable,
-        tags: Sequence["TagTable"],
-    ) -> TitleTable:
-        title.tags = [tag for tag in tags if tag not in title.tags]
-        return await self._save(title)
+        title_ids: Sequence[int],
+        tag_ids: Sequence[int],
+    ) -> dict[int, list[int]]:
+        """Link tags to titles, keeping their current tags."""
+        return await self.update_tags(title_ids, add=tag_ids)
 
     async def remove_tags(
         self,
-        title: TitleTable,
-        tags: Sequence["TagTable"],
-    ) -> TitleTable:
-        title.tags = [tag for tag in title.tags if tag not in tags]
-        return await self._save(title)
+        title_ids: Sequence[int],
+        tag_ids: Sequence[int],
+    ) -> dict[int, list[int]]:
+        """Unlink tags from titles."""
+        return await self.update_tags(title_ids, remove=tag_ids)
+
+    async def update_tags(
+        self,
+        title_ids: Sequence[int],
+        *,
+        add: Sequence[int] = (),
+        remove: Sequence[int] = (),
+    ) -> dict[int, list[int]]:
+        """Remove and then add tags to many titles in a single transaction.
+
+        Unknown titles and tags are ignored. Returns the tag IDs of every
+        existing title after the change.
+        """
+        async with self._session() as session:
+            changes = await self._link_tags(session, title_ids, add=add, remove=remove)
+            result = await session.execute(
+                select(TitleTable.id, TitleTagTable.tag_id)
+                .outerjoin(TitleTagTable, TitleTagTable.title_id == TitleTable.id)
+                .where(TitleTable.id == any_(_ids(title_ids)))
+                .order_by(TitleTable.id, TitleTagTable.tag_id),
+            )
+            await session.commit()
+
+        self._apply_links(changes)
+
+        tags: dict[int, list[int]] = {}
+        for title_id, tag_id in result.tuples():
+            title_tags = tags.setdefault(title_id, [])
+            if tag_id is not None:
+                title_tags.append(tag_id)
+        return tags
+
+    async def retag_titles(
+        self,
+        tag_id: int,
+        *,
+        add: Sequence[int] = (),
+        remove: Sequence[int] = (),
+        deactivate: bool = False,
+    ) -> int:
+        """Remove and then add tags to every title carrying a tag.
+
+        Runs in a single transaction, which also deactivates the tag if asked,
+        so merging a tag into another is `remove=[tag_id], add=[target_id],
+        deactivate=True`. The links of the tag are locked while they are read,
+        and links already present are skipped. Unknown tags are ignored.
+
+        Returns the number of changed titles.
+        """
+        async with self._session() as session:
+            title_ids = (
+                await session.scalars(
+                    select(TitleTagTable.title_id)
+                    .where(TitleTagTable.tag_id == tag_id)
+                    .with_for_update(),
+                )
+            ).all()
+            changes = await self._link_tags(session, title_ids, add=add, remove=remove)
+            if deactivate:
+                await session.execute(
+                    update(TagTable)
+                    .where(TagTable.id == tag_id)
+                    .values(is_active=False, updated_at=current_datetime()),
+                )
+            await session.commit()
+
+        self._apply_links(changes)
+        return len({title_id for title_id, _, _ in changes})
+
+    async def _link_tags(
+        self,
+        session: "AsyncSession",
+        title_ids: Sequence[int],
+        *,
+        add: Sequence[int],
+        remove: Sequence[int],
+    ) -> list[tuple[int, int, bool]]:
+        """Remove and then add tags to many titles, without committing.
+
+        Each change is one `DELETE ... = ANY(...)` or `INSERT ... ON CONFLICT DO
+        NOTHING` statement on `db_title_tags`. The changed titles are touched,
+        and the links of the active ones counted in the tag usage. Returns the
+        `(title_id, tag_id, linked)` changes, for `_apply_links` once committed.
+        """
+        changes: list[tuple[int, int, bool]] = []
+        if not title_ids:
+            return changes
+
+        if remove:
+            removed = await session.execute(
+                delete(TitleTagTable)
+                .where(
+                    TitleTagTable.title_id == any_(_ids(title_ids)),
+                    TitleTagTable.tag_id == any_(_ids(remove)),
+                )
+                .returning(TitleTagTable.title_id, TitleTagTable.tag_id),
+            )
+            changes += [(*row, False) for row in removed.tuples()]
+
+        if add:
+            added = await session.execute(
+                insert(TitleTagTable)
+                .from_select(
+                    ["title_id", "tag_id"],
+                    select(TitleTable.id, TagTable.id)
+                    .join(TagTable, true())
+                    .where(
+                        TitleTable.id == any_(_ids(title_ids)),
+                        TagTable.id == any_(_ids(add)),
+                    ),
+                )
+                .on_conflict_do_nothing()
+                .returning(TitleTagTable.title_id, TitleTagTable.tag_id),
+            )
+            changes += [(*row, True) for row in added.tuples()]
+
+        active: set[int] = set()
+        if changed := {title_id for title_id, _, _ in changes}:
+            touched = await session.execute(
+                update(TitleTable)
+                .where(TitleTable.id == any_(_ids(changed)))
+                .values(updated_at=current_datetime())
+                .returning(TitleTable.id, TitleTable.is_active)
+                .execution_options(synchronize_session=False),
+            )
+            active = {title_id for title_id, is_active in touched.tuples() if is_active}
+
+        usage: Counter[int] = Counter()
+        for title_id, tag_id, linked in changes:
+            if title_id in active:
+                usage[tag_id] += 1 if linked else -1
+        await self._add_tag_usage(session, usage)
+        return changes
+
+    def _apply_links(self, changes: Sequence[tuple[int, int, bool]]) -> None:
+        """Apply committed link changes to the title tag index."""
+        for title_id, tag_id, linked in changes:
+            if linked:
+                self.index.add_tags(title_id, [tag_id])
+            else:
+                self.index.remove_tags(title_id, [tag_id])
+
+    async def rebuild_index(self) -> TitleIndexStats:
+        """Rebuild the title tag index from the database."""
+        async with self._session() as session:
+            cursor = await session.scalar(select(func.max(TitleTable.updated_at)))
+            titles = await session.execute(
+                select(TitleTable.id, TitleTable.content_type).where(
+                    TitleTable.is_active,
+                ),
+            )
+            title_tags = await session.execute(
+                select(TitleTagTable.title_id, TitleTagTable.tag_id),
+            )
+            self.index.load(
+                titles.tuples(),
+                title_tags.tuples(),
+                cursor=cursor,
+            )
+        return self.index.stats()
+
+    async def refresh_index(self) -> None:
+        """Apply the title changes made by every worker to the title tag index.
+
+        Titles changed since the last refresh, minus `_INDEX_REFRESH_OVERLAP`
+        for transactions committed late, are reloaded with their tags.
+        """
+        if self.index.cursor is None:
+            await self.rebuild_index()
+            return
+
+        tag_ids = (
+            select(func.array_agg(TitleTagTable.tag_id))
+            .where(TitleTagTable.title_id == TitleTable.id)
+            .scalar_subquery()
+        )
+        query = select(
+            TitleTable.id,
+            TitleTable.content_type,
+            TitleTable.is_active,
+            func.coalesce(tag_ids, []),
+            TitleTable.updated_at,
+        ).where(TitleTable.updated_at >= self.index.cursor - _INDEX_REFRESH_OVERLAP)
+        async with self._session() as session:
+            rows = (await session.execute(query)).tuples().all()
+
+        self.index.update(
+            [row[:-1] for row in rows],
+            cursor=max((row[-1] for row in rows), default=None),
+        )
 
     async def get_title_by_name(self, name: str) -> TitleTable | None:
         query = select(TitleTable).filter(TitleTable.name == name)
@@ -98,36 +838,555 @@ class TitleRepository(BaseRepository):
         self,
         title_id: int,
     ) -> Rating:
-        """Get a rating by specified filters."""
+        """Get the rating of a title from its rating summary."""
+        query = select(TitleRatingSummaryTable).where(
+            TitleRatingSummaryTable.target_id == title_id,
+        )
+        return self._to_rating((await self._execute_query(query)).first())
 
+    async def get_title_ratings(
+        self,
+        title_ids: Sequence[int],
+        user_id: int | None = None,
+    ) -> Sequence[TargetRating]:
+        """Get the ratings of many titles, and the user's own rating of each."""
         async with self._session() as session:
-            query = (
-                select(TitleRatingTable.value, func.count(TitleRatingTable.value))
-                .where(TitleRatingTable.target_id == title_id)
-                .group_by(TitleRatingTable.value)
+            summaries = {
+                summary.target_id: summary
+                for summary in await session.scalars(
+                    select(TitleRatingSummaryTable).where(
+                        TitleRatingSummaryTable.target_id.in_(title_ids),
+                    ),
+                )
+            }
+
+            user_ratings: dict[int, float] = {}
+            if user_id is not None:
+                result = await session.execute(
+                    select(TitleRatingTable.target_id, TitleRatingTable.value).where(
+                        TitleRatingTable.user_id == user_id,
+                        TitleRatingTable.target_id.in_(title_ids),
+                    ),
+                )
+                user_ratings = dict(result.tuples().all())
+
+        return [
+            TargetRating(
+                **self._to_rating(summaries.get(title_id)).model_dump(),
+                target_id=title_id,
+                user_rating=user_ratings.get(title_id),
             )
+            for title_id in dict.fromkeys(title_ids)
+        ]
 
-            result = (await session.execute(query)).all()
+    @staticmethod
+    def _to_rating(summary: TitleRatingSummaryTable | None) -> Rating:
+        """Build a rating from a rating summary."""
+        if summary is None:
+            return Rating(average=0, ratings={})
 
-            rating_counts = {int(key): int(value) for key, value in result}
+        return Rating(
+            average=summary.average,
+            ratings={
+                value: count
+                for value, count in enumerate(summary.buckets, start=1)
+                if count
+            },
+        )
 
-            total_ratings = sum(rating_counts.values())
-            weighted_sum = sum(value * count for value, count in rating_counts.items())
+    async def upsert_title_rating(self, params: "CreateRating") -> bool:
+        """Create or change the rating of a user, adjusting the title summary.
 
-            average_rating = weighted_sum / total_ratings if total_ratings > 0 else 0
+        The current rating is locked with `FOR UPDATE` and the summary is
+        adjusted by the difference with the locked value, in the same
+        transaction. A missing rating is inserted with `ON CONFLICT DO
+        NOTHING`; if a concurrent request inserted it first, it is locked and
+        changed instead.
 
-            return Rating(average=average_rating, ratings=rating_counts)
+        Returns whether the rating was created.
+        """
+        rating = (
+            TitleRatingTable.user_id == params.user_id,
+            TitleRatingTable.target_id == params.target_id,
+        )
+        current = select(TitleRatingTable.value).where(*rating).with_for_update()
+        insert_rating = (
+            insert(TitleRatingTable)
+            .values(**params.model_dump())
+            .on_conflict_do_nothing()
+            .returning(TitleRatingTable.value)
+        )
+
+        async with self._session() as session:
+            while True:
+                previous = (await session.execute(current)).scalar()
+                if previous is not None:
+                    await session.execute(
+                        update(TitleRatingTable)
+                        .where(*rating)
+                        .values(value=params.value, rated_at=current_datetime()),
+                    )
+                    break
+                if (await session.execute(insert_rating)).first() is not None:
+                    break
 
-    async def create_title_rating(self, params: "CreateRating") -> "TitleRatingTable":
-        return await self._save(TitleRatingTable(**params.model_dump()))
+            if previous is None:
+                await self._apply_rating(session, params.target_id, added=params.value)
+            elif previous != params.value:
+                await self._apply_rating(
+                    session,
+                    params.target_id,
+                    added=params.value,
+                    removed=previous,
+                )
+            await session.commit()
+        return previous is None
 
     async def delete_title_rating(self, title_id: int, user_id: int) -> None:
-        smt = delete(TitleRatingTable).where(
-            TitleRatingTable.target_id == title_id,
-            TitleRatingTable.user_id == user_id,
+        smt = (
+            delete(TitleRatingTable)
+            .where(
+                TitleRatingTable.target_id == title_id,
+                TitleRatingTable.user_id == user_id,
+            )
+            .returning(TitleRatingTable.value)
+        )
+        async with self._session() as session:
+            value = (await session.execute(smt)).scalar()
+            if value is not None:
+                await self._apply_rating(session, title_id, removed=value)
+            await session.commit()
+
+    async def reconcile_tag_usage(self) -> None:
+        """Recount the active titles of every tag.
+
+        Fixes any drift between `db_tags.usage_count` and `db_title_tags`.
+        Concurrent runs from other workers are skipped.
+        """
+        counts = (
+            select(
+                TagTable.id.label("tag_id"),
+                func.count(TitleTable.id).label("usage_count"),
+            )
+            .outerjoin(TitleTagTable, TitleTagTable.tag_id == TagTable.id)
+            .outerjoin(
+                TitleTable,
+                (TitleTable.id == TitleTagTable.title_id) & TitleTable.is_active,
+            )
+            .group_by(TagTable.id)
+            .subquery()
         )
-        await self._delete(smt)
+        reconcile = (
+            update(TagTable)
+            .where(
+                TagTable.id == counts.c.tag_id,
+                TagTable.usage_count != counts.c.usage_count,
+            )
+            .values(usage_count=counts.c.usage_count, updated_at=TagTable.updated_at)
+        )
+
+        async with self._session() as session:
+            lock = func.pg_try_advisory_xact_lock(_RECONCILE_TAG_USAGE_LOCK)
+            if not (await session.execute(select(lock))).scalar():
+                return
+            await session.execute(reconcile)
+            await session.commit()
+
+    @staticmethod
+    async def _add_tag_usage(
+        session: "AsyncSession",
+        deltas: Mapping[int, int],
+    ) -> None:
+        """Add to the usage count of tags, in one statement.
+
+        Tag rows are locked in ID order first, so concurrent changes to the
+        same tags cannot deadlock.
+        """
+        deltas = {tag_id: delta for tag_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        tag_ids = sorted(deltas)
+        await session.execute(
+            select(TagTable.id)
+            .where(TagTable.id == any_(_ids(tag_ids)))
+            .order_by(TagTable.id)
+            .with_for_update(),
+        )
+        values = select(
+            func.unnest(_ids(tag_ids)).label("tag_id"),
+            func.unnest(_ids(deltas[tag_id] for tag_id in tag_ids)).label("delta"),
+        ).subquery()
+        await session.execute(
+            update(TagTable)
+            .where(TagTable.id == values.c.tag_id)
+            .values(
+                usage_count=TagTable.usage_count + values.c.delta,
+                updated_at=TagTable.updated_at,
+            ),
+        )
+
+    @staticmethod
+    async def _apply_rating(
+        session: "AsyncSession",
+        title_id: int,
+        *,
+        added: float | None = None,
+        removed: float | None = None,
+    ) -> None:
+        """Add and/or remove a rating value from a title summary in one upsert."""
+        deltas = [0] * RATING_BUCKETS
+        if added is not None:
+            deltas[int(added) - 1] += 1
+        if removed is not None:
+            deltas[int(removed) - 1] -= 1
+        count = sum(deltas)
+        total = (added or 0) - (removed or 0)
+
+        summary = TitleRatingSummaryTable.__table__.c
+        upsert = insert(TitleRatingSummaryTable).values(
+            target_id=title_id,
+            count=count,
+            total=total,
+            buckets=deltas,
+        )
+        await session.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[summary.target_id],
+                set_={
+                    "count": summary.count + count,
+                    "total": summary.total + total,
+                    "updated_at": func.now(),
+                    "buckets": array(
+                        [
+                            summary.buckets[bucket] + delta
+                            if delta
+                            else summary.buckets[bucket]
+                            for bucket, delta in enumerate(deltas, start=1)
+                        ],
+                    ),
+                },
+            ),
+        )
+
+    async def reconcile_rating_summaries(self) -> None:
+        """Recompute every title rating summary from the raw ratings.
+
+        Fixes any drift between `db_title_rating_summaries` and
+        `db_title_ratings`. Concurrent runs from other workers are skipped.
+        """
+        ratings = select(
+            TitleRatingTable.target_id,
+            func.count(),
+            func.sum(TitleRatingTable.value),
+            array(
+                [
+                    func.count().filter(TitleRatingTable.value == value)
+                    for value in range(1, RATING_BUCKETS + 1)
+                ],
+            ),
+        ).group_by(TitleRatingTable.target_id)
+        upsert = insert(TitleRatingSummaryTable).from_select(
+            ["target_id", "count", "total", "buckets"],
+            ratings,
+        )
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[TitleRatingSummaryTable.target_id],
+            set_={
+                "count": upsert.excluded.count,
+                "total": upsert.excluded.total,
+                "buckets": upsert.excluded.buckets,
+                "updated_at": func.now(),
+            },
+            where=tuple_(
+                TitleRatingSummaryTable.count,
+                TitleRatingSummaryTable.total,
+                TitleRatingSummaryTable.buckets,
+            ).is_distinct_from(
+                tuple_(
+                    upsert.excluded.count,
+                    upsert.excluded.total,
+                    upsert.excluded.buckets,
+                ),
+            ),
+        )
+        clear = (
+            update(TitleRatingSummaryTable)
+            .where(
+                TitleRatingSummaryTable.count != 0,
+                ~select(TitleRatingTable.target_id)
+                .where(TitleRatingTable.target_id == TitleRatingSummaryTable.target_id)
+                .exists(),
+            )
+            .values(
+                count=0,
+                total=0,
+                buckets=[0] * RATING_BUCKETS,
+                updated_at=func.now(),
+            )
+        )
+
+        async with self._session() as session:
+            lock = func.pg_try_advisory_xact_lock(_RECONCILE_RATINGS_LOCK)
+            if not (await session.execute(select(lock))).scalar():
+                return
+            await session.execute(upsert)
+            await session.execute(clear)
+            await session.commit()
+
+    async def rebuild_ranking(self) -> None:
+        """Rebuild the title rankings from the rating summaries."""
+        epoch = current_datetime()
+        mean = (
+            select(
+                func.sum(TitleRatingSummaryTable.total)
+                / func.nullif(func.sum(TitleRatingSummaryTable.count), 0),
+            )
+            .join(TitleTable, TitleTable.id == TitleRatingSummaryTable.target_id)
+            .where(TitleTable.is_active)
+        )
+        query = self._ranking_query(epoch).where(
+            TitleTable.is_active,
+            TitleRatingSummaryTable.count > 0,
+        )
+
+        async with self._session() as session:
+            average = (await session.execute(mean)).scalar()
+            rows = (await session.execute(query)).tuples().all()
+
+        self.ranking.load(
+            [row[:-1] for row in rows],
+            mean=average or 0,
+            epoch=epoch,
+            cursor=max((row[-1] for row in rows), default=None),
+        )
+
+    async def refresh_ranking(self) -> None:
+        """Update the rankings of the titles whose rating summary changed.
+
+        Titles or summaries changed since the last refresh, minus
+        `_RANKING_REFRESH_OVERLAP` for transactions committed late, are
+        recomputed, so titles deactivated or moved to another content type by
+        other workers are picked up. The mean rating used by the top-rated
+        score is only updated by `rebuild_ranking`.
+        """
+        if self.ranking.cursor is None:
+            await self.rebuild_ranking()
+            return
+
+        since = self.ranking.cursor - _RANKING_REFRESH_OVERLAP
+        query = self._ranking_query(self.ranking.epoch, since).where(
+            or_(
+                TitleRatingSummaryTable.updated_at >= since,
+                TitleTable.updated_at >= since,
+            ),
+        )
+        async with self._session() as session:
+            rows = (await session.execute(query)).tuples().all()
+
+        self.ranking.update(
+            [row[:-1] for row in rows],
+            cursor=max((row[-1] for row in rows), default=None),
+        )
+
+    @staticmethod
+    def _ranking_query(
+        epoch: datetime,
+        since: datetime | None = None,
+    ) -> "Select[tuple[int, TitleContentTypeEnum, int, float, float, datetime]]":
+        """Select `(id, content_type, count, total, trending, updated_at)` rows.
+
+        Inactive titles have a count of 0, and `updated_at` is the latest
+        change of the title or its summary. The trending score sums
+        `2 ^ ((rated_at - epoch) / half_life)` over the ratings of the last
+        `_TRENDING_HALF_LIVES` half-lives.
+        """
+        half_life = Settings.TITLE_TRENDING_HALF_LIFE
+        trending = (
+            select(
+                TitleRatingTable.target_id,
+                func.sum(
+                    func.power(
+                        2,
+                        func.extract("epoch", TitleRatingTable.rated_at - epoch)
+                        / half_life,
+                    ),
+                ).label("score"),
+            )
+            .where(
+                TitleRatingTable.rated_at
+                > epoch - timedelta(seconds=half_life * _TRENDING_HALF_LIVES),
+            )
+            .group_by(TitleRatingTable.target_id)
+        )
+        if since is not None:
+            trending = trending.where(
+                TitleRatingTable.target_id.in_(
+                    select(TitleRatingSummaryTable.target_id).where(
+                        TitleRatingSummaryTable.updated_at >= since,
+                    ),
+                )
+                | TitleRatingTable.target_id.in_(
+                    select(TitleTable.id).where(TitleTable.updated_at >= since),
+                ),
+            )
+        scores = trending.subquery()
+
+        return (
+            select(
+                TitleTable.id,
+                TitleTable.content_type,
+                case(
+                    (TitleTable.is_active, TitleRatingSummaryTable.count),
+                    else_=0,
+                ),
+                TitleRatingSummaryTable.total,
+                func.coalesce(scores.c.score, 0.0),
+                func.greatest(
+                    TitleRatingSummaryTable.updated_at,
+                    TitleTable.updated_at,
+                ),
+            )
+            .join(
+                TitleRatingSummaryTable,
+                TitleRatingSummaryTable.target_id == TitleTable.id,
+            )
+            .outerjoin(scores, scores.c.target_id == TitleTable.id)
+        )
+
+    async def update_title_cover(
+        self,
+        title: TitleTable,
+        cover: str,
+        variants: Sequence[CoverVariant] = (),
+        placeholder: str | None = None,
+        *,
+        content_type: str | None = None,
+    ) -> TitleTable:
+        """Set a cover on a title, moving its reference between cover blobs.
+
+        The title row is locked first, so the blob released is the cover the
+        title holds in the database, even with concurrent cover changes.
+        """
+        stored_variants = [variant.model_dump(exclude={"url"}) for variant in variants]
+        now = current_datetime()
+
+        async with self._session() as session:
+            previous = (
+                await session.execute(
+                    select(TitleTable.cover_image)
+                    .where(TitleTable.id == title.id)
+                    .with_for_update(),
+                )
+            ).scalar()
+            await session.execute(
+                update(TitleTable)
+                .where(TitleTable.id == title.id)
+                .values(
+                    cover_image=cover,
+                    cover_variants=stored_variants,
+                    cover_placeholder=placeholder,
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False),
+            )
+            if previous != cover:
+                upsert = insert(CoverBlobTable).values(
+                    key=cover,
+                    content_type=content_type,
+                    variants=stored_variants,
+                    placeholder=placeholder,
+                    ref_count=1,
+                )
+                await session.execute(
+                    upsert.on_conflict_do_update(
+                        index_elements=[CoverBlobTable.key],
+                        set_={
+                            "content_type": upsert.excluded.content_type,
+                            "variants": upsert.excluded.variants,
+                            "placeholder": upsert.excluded.placeholder,
+                            "ref_count": CoverBlobTable.ref_count + 1,
+                            "updated_at": now,
+                        },
+                    ),
+                )
+                if previous is not None:
+                    await session.execute(
+                        update(CoverBlobTable)
+                        .where(CoverBlobTable.key == previous)
+                        .values(ref_count=CoverBlobTable.ref_count - 1, updated_at=now),
+                    )
+            await session.commit()
 
-    async def update_title_cover(self, title: TitleTable, cover: str) -> TitleTable:
         title.cover_image = cover
-        return await self._save(title)
+        title.cover_variants = stored_variants
+        title.cover_placeholder = placeholder
+        title.updated_at = now
+        return title
+
+    async def get_cover_blob(self, key: str) -> CoverBlobTable | None:
+        query = select(CoverBlobTable).where(CoverBlobTable.key == key)
+        return (await self._execute_query(query)).first()
+
+    async def reserve_cover_blob(self, key: str) -> None:
+        """Track a cover about to be uploaded, so it is collected if never used."""
+        statement = insert(CoverBlobTable).values(key=key)
+        async with self._session() as session:
+            await session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[CoverBlobTable.key],
+                    set_={"updated_at": current_datetime()},
+                ),
+            )
+            await session.commit()
+
+    async def forget_cover_blob(self, key: str) -> None:
+        """Stop tracking a cover no title uses, once it is deleted."""
+        async with self._session() as session:
+            await session.execute(
+                delete(CoverBlobTable).where(
+                    CoverBlobTable.key == key,
+                    CoverBlobTable.ref_count == 0,
+                ),
+            )
+            await session.commit()
+
+    async def pop_unreferenced_cover_blobs(
+        self,
+        *,
+        grace: int,
+        limit: int,
+        delete_objects: Callable[
+            [Sequence[tuple[str, list[dict[str, Any]]]]],
+            Awaitable[None],
+        ],
+    ) -> Sequence[tuple[str, list[dict[str, Any]]]]:
+        """Delete covers no title used for `grace` seconds.
+
+        Rows are locked with `SKIP LOCKED`, so concurrent collectors never pick
+        the same covers. They are deleted, then `delete_objects` deletes their
+        stored objects, and only then is the transaction committed. A cover
+        reserved meanwhile waits on the row lock and is then found missing, so
+        it is stored again. Returns the key and variants of every deleted cover.
+        """
+        unreferenced = (
+            select(CoverBlobTable.key)
+            .where(
+                CoverBlobTable.ref_count == 0,
+                CoverBlobTable.updated_at
+                < current_datetime() - timedelta(seconds=grace),
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        async with self._session() as session:
+            result = await session.execute(
+                delete(CoverBlobTable)
+                .where(CoverBlobTable.key.in_(unreferenced.scalar_subquery()))
+                .returning(CoverBlobTable.key, CoverBlobTable.variants),
+            )
+            blobs = result.tuples().all()
+            if blobs:
+                await delete_objects(blobs)
+            await session.commit()
+        return blobs
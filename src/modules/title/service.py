@@ -1,29 +1,98 @@
-from collections.abc import Sequence
-from typing import TYPE_CHECKING
+import asyncio
+import base64
+import csv
+import hashlib
+import io
+import itertools
+import logging
+import re
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Iterator, Sequence
+from datetime import timedelta
+from typing import IO, TYPE_CHECKING, Any, TypeVar
 
 import magic
+from botocore.exceptions import ClientError
 from fastapi import UploadFile
-
-from src.core.contexts.aws_s3 import AwsContext
+from fastapi.concurrency import run_in_threadpool
+from PIL import Image, UnidentifiedImageError
+from pydantic import ValidationError
+
+from src._utils import current_datetime
+from src.core.contexts.aws_s3 import AwsContext, S3ClientStats
+from src.core.contexts.process_pool import ProcessPoolContext
+from src.core.uploads import MultipartUpload, limit_size, read_head
 from src.core.validators import RegexValidator
-from src.exceptions.bad_request import InvalidMimeTypeError
+from src.exceptions.bad_request import InvalidCoverUploadError, InvalidMimeTypeError
+from src.exceptions.base import ApiError
 from src.exceptions.conflict import TitleNameAlreadyExistsError
 from src.exceptions.not_found import TagNotFoundError, TitleNotFoundError
-from src.modules._rating_dto import CreateRating, PostRating
-from src.modules.tag.dtos import Tag
+from src.exceptions.payload_too_large import FileTooLargeError
+from src.modules._rating_dto import (
+    CreateRating,
+    GetRatings,
+    PostedRating,
+    PostRating,
+)
+from src.modules.title import covers
 from src.modules.title.dtos import (
+    CompleteCoverUpload,
+    CoverUpload,
+    CoverVariant,
+    CreateCoverUpload,
     CreateTitle,
+    GetRankedTitles,
+    GetSimilarTitles,
     GetTitles,
+    ImportTitles,
+    PartialTitle,
+    ScoredTitle,
+    SearchTitles,
     Title,
+    TitleFields,
+    TitleImportReport,
+    TitleImportRow,
+    TitleIndexStats,
+    TitlePage,
+    TitleTagIds,
     UpdateTitle,
+    UpdateTitlesTags,
     UpdateTitleTags,
 )
+from src.modules.title.enums import (
+    TitleFieldEnum,
+    TitleImportFormatEnum,
+    TitleImportStatusEnum,
+    TitleIncludeEnum,
+)
 from src.settings import Settings
 
 if TYPE_CHECKING:
-    from src.modules._rating_dto import Rating
+    from src.modules._rating_dto import Rating, TargetRating
     from src.modules.tag.repository import TagRepository
     from src.modules.title.repository import TitleRepository
+    from src.modules.title.table import CoverBlobTable, TitleTable
+
+logger = logging.getLogger(__name__)
+
+_MIME_SNIFF_SIZE = 2048
+_COVER_MIME_TYPES = "jpeg, webp, jpg, png, gif"
+_S3_DELETE_BATCH = 1000
+_IMPORT_READ_BATCH = 1000
+_IMMUTABLE = "public, max-age=31536000, immutable"
+_INCOMING_COVERS = "covers/incoming"
+
+_TitleT = TypeVar("_TitleT", bound=Title | PartialTitle)
+
+_FIELD_ATTRIBUTES: dict[TitleFieldEnum, tuple[str, ...]] = {
+    TitleFieldEnum.NAME: ("name",),
+    TitleFieldEnum.DESCRIPTION: ("description",),
+    TitleFieldEnum.RELEASE_DATE: ("release_date",),
+    TitleFieldEnum.CONTENT_TYPE: ("content_type",),
+    TitleFieldEnum.COVER: ("cover_image", "cover_variants", "cover_placeholder"),
+    TitleFieldEnum.CREATED_AT: ("created_at",),
+    TitleFieldEnum.UPDATED_AT: ("updated_at",),
+}
 
 
 class TitleService:
@@ -34,22 +103,180 @@ class TitleService:
     ) -> None:
         self.repository = title_repository
         self.tag_repository = tag_repository
-        self.aws_session = AwsContext.get_session()
         self.MIME = magic.Magic(mime=True)
 
     async def get_title(self, title_id: int) -> Title:
         """Get a title by ID."""
-        title = await self.repository.get_title(id=title_id)
+        title = await self.repository.get_cached_title(title_id)
 
         if not title:
             raise TitleNotFoundError(titleId=title_id)
 
-        return Title(**title.model_dump())
+        return (await self._with_cover_urls([title]))[0]
+
+    async def get_partial_title(
+        self,
+        title_id: int,
+        params: TitleFields,
+    ) -> PartialTitle:
+        """Get a title by ID, with the requested fields.
+
+        The title is read whole through the title cache and then trimmed, as
+        a cache hit is cheaper than any projection.
+        """
+        title = await self.repository.get_cached_title(title_id)
+
+        if not title:
+            raise TitleNotFoundError(titleId=title_id)
+
+        keep = self._selected_attributes(params)
+        data = title.model_dump()
+        if keep is not None:
+            data = {key: value for key, value in data.items() if key in keep}
+        return (await self._with_cover_urls([PartialTitle(**data)]))[0]
+
+    async def get_title_version(self, title_id: int) -> str | None:
+        """Get the version of a title, for conditional requests.
+
+        Includes the period of the cover URLs, so clients refresh presigned
+        URLs before they expire.
+        """
+        version = await self.repository.get_title_version(title_id)
+        if version is None:
+            return None
+        return f"{version}|{AwsContext.get_url_epoch()}"
+
+    async def get_titles(self, params: GetTitles) -> TitlePage:
+        """Get a page of titles, and the facet counts of the filters if asked."""
+        keep = self._selected_attributes(params)
+        titles, next_cursor = await self.repository.get_titles(
+            params,
+            attributes=None if keep is None else keep - {"id", "tags"},
+            with_tags=keep is None or "tags" in keep,
+        )
+        items = []
+        for title in titles:
+            data = title.model_dump()
+            if keep is not None:
+                data = {key: value for key, value in data.items() if key in keep}
+            items.append(PartialTitle(**data))
+
+        page = TitlePage(
+            items=await self._with_cover_urls(items),
+            next_cursor=next_cursor,
+        )
+        if params.facets:
+            page.facets = await self.repository.get_title_facets(params)
+        return page
+
+    @staticmethod
+    def _selected_attributes(params: TitleFields) -> set[str] | None:
+        """Get the title attributes a sparse fieldset selects, or `None` for all."""
+        if not params.fields:
+            return None
+
+        attributes = {"id"}
+        for field in params.fields:
+            attributes.update(_FIELD_ATTRIBUTES[field])
+        if TitleIncludeEnum.TAGS in params.include:
+            attributes.add("tags")
+        return attributes
+
+    async def search_titles(self, params: SearchTitles) -> Sequence[ScoredTitle]:
+        """Search titles ranked by relevance."""
+        return await self._with_cover_urls(
+            [
+                ScoredTitle(**title.model_dump(), score=score)
+                for title, score in await self.repository.search_titles(params)
+            ],
+        )
+
+    async def get_top_titles(self, params: GetRankedTitles) -> Sequence[ScoredTitle]:
+        """Get a page of the top-rated titles, scored by Bayesian average."""
+        ranking = self.repository.ranking.top(
+            params.content_type,
+            params.offset,
+            params.limit,
+        )
+        return await self._ranked_titles(ranking)
+
+    async def get_trending_titles(
+        self,
+        params: GetRankedTitles,
+    ) -> Sequence[ScoredTitle]:
+        """Get a page of the trending titles, scored by decayed rating activity."""
+        ranking = self.repository.ranking.trending(
+            params.content_type,
+            params.offset,
+            params.limit,
+        )
+        return await self._ranked_titles(ranking)
+
+    async def get_similar_titles(
+        self,
+        title_id: int,
+        params: GetSimilarTitles,
+    ) -> Sequence[ScoredTitle]:
+        """Get the titles most similar to a title by IDF-weighted tag overlap."""
+        if not await self.repository.get_cached_title(title_id):
+            raise TitleNotFoundError(titleId=title_id)
+
+        return await self._ranked_titles(
+            self.repository.index.similar(title_id, params.limit),
+        )
+
+    async def _ranked_titles(
+        self,
+        ranking: Sequence[tuple[int, float]],
+    ) -> Sequence[ScoredTitle]:
+        scores = dict(ranking)
+        titles = await self.repository.get_titles_by_ids(list(scores))
+        return await self._with_cover_urls(
+            [
+                ScoredTitle(**title.model_dump(), score=scores[title.id])
+                for title in titles
+            ],
+        )
 
-    async def get_titles(self, params: GetTitles) -> Sequence[Title]:
-        """Get all titles."""
-        titles = await self.repository.get_titles(params)
-        return [Title(**title.model_dump()) for title in titles]
+    @staticmethod
+    async def _with_cover_urls(titles: Sequence[_TitleT]) -> list[_TitleT]:
+        """Fill the download URLs of the covers and cover variants of titles."""
+        keys = [
+            key
+            for title in titles
+            for key in (
+                title.cover_image,
+                *(variant.key for variant in title.cover_variants or ()),
+            )
+            if key
+        ]
+        urls = await AwsContext.get_object_urls(keys) if keys else {}
+        return [
+            title.model_copy(
+                update={
+                    "cover_url": urls.get(title.cover_image or ""),
+                    "cover_variants": [
+                        variant.model_copy(update={"url": urls[variant.key]})
+                        for variant in title.cover_variants or ()
+                    ],
+                },
+            )
+            if "cover_image" in title.model_fields_set
+            else title
+            for title in titles
+        ]
+
+    def get_index_stats(self) -> TitleIndexStats:
+        """Get the title tag index statistics."""
+        return self.repository.index.stats()
+
+    def get_storage_stats(self) -> S3ClientStats:
+        """Get the cover storage clients statistics."""
+        return AwsContext.stats()
+
+    async def rebuild_index(self) -> TitleIndexStats:
+        """Rebuild the title tag index."""
+        return await self.repository.rebuild_index()
 
     async def create_title(self, create_title: CreateTitle) -> Title:
         """Create a title."""
@@ -58,11 +285,164 @@ class TitleService:
 
         tags = await self.tag_repository.get_tags_by_ids(create_title.tags)
 
-        title = await self.repository.create_title(create_title, tags)
-        return Title(
-            **title.model_dump(),
-            tags=[Tag(**tag.model_dump()) for tag in tags],
+        title = await self.repository.create_title(
+            create_title,
+            [tag.id for tag in tags],
+        )
+        return Title(**title.model_dump(), tags=list(tags))
+
+    async def import_titles(
+        self,
+        file: UploadFile,
+        params: ImportTitles,
+    ) -> TitleImportReport:
+        """Create titles in bulk from an NDJSON or CSV file.
+
+        Each NDJSON line, or CSV record after the header, is a `CreateTitle`.
+        CSV tags are a `|` separated list of tag IDs. Rows naming an existing
+        title, or repeating a name earlier in the file, are not imported. Tag
+        IDs matching no tag are not linked, and are reported on their row.
+        """
+        invalid: list[TitleImportRow] = []
+
+        async def valid_rows() -> AsyncIterator[tuple[int, CreateTitle]]:
+            async for line, row in self._iter_rows(file.file, params.format):
+                try:
+                    if isinstance(row, str):
+                        yield line, CreateTitle.model_validate_json(row)
+                    else:
+                        yield line, CreateTitle.model_validate(row)
+                except ValidationError as error:
+                    invalid.append(
+                        TitleImportRow(
+                            line=line,
+                            status=TitleImportStatusEnum.INVALID,
+                            error="; ".join(
+                                f"{'.'.join(map(str, err['loc'])) or 'row'}: "
+                                f"{err['msg']}"
+                                for err in error.errors()
+                            ),
+                        ),
+                    )
+
+        rows = [
+            TitleImportRow(
+                line=line,
+                status=TitleImportStatusEnum.CREATED
+                if created
+                else TitleImportStatusEnum.EXISTS,
+                title_id=title_id,
+                unknown_tags=unknown_tags,
+            )
+            for (
+                line,
+                title_id,
+                created,
+                unknown_tags,
+            ) in await self.repository.import_titles(valid_rows())
+        ]
+        created = sum(row.status == TitleImportStatusEnum.CREATED for row in rows)
+        return TitleImportReport(
+            created=created,
+            existing=len(rows) - created,
+            invalid=len(invalid),
+            rows=sorted([*rows, *invalid], key=lambda row: row.line),
+        )
+
+    @staticmethod
+    async def _iter_rows(
+        file: IO[bytes],
+        file_format: TitleImportFormatEnum,
+    ) -> AsyncIterator[tuple[int, str | dict[str, Any]]]:
+        """Stream the numbered rows of an import file, read in the thread pool.
+
+        Spooled uploads are read from disk, so rows are read by batches of
+        `_IMPORT_READ_BATCH` off the event loop.
+        """
+        rows = TitleService._read_rows(file, file_format)
+        while batch := await run_in_threadpool(
+            list,
+            itertools.islice(rows, _IMPORT_READ_BATCH),
+        ):
+            for row in batch:
+                yield row
+
+    @staticmethod
+    def _read_rows(
+        file: IO[bytes],
+        file_format: TitleImportFormatEnum,
+    ) -> Iterator[tuple[int, str | dict[str, Any]]]:
+        """Stream the numbered rows of an import file."""
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        try:
+            if file_format == TitleImportFormatEnum.NDJSON:
+                for line, row in enumerate(text, start=1):
+                    if row.strip():
+                        yield line, row
+                return
+
+            for line, record in enumerate(csv.DictReader(text), start=1):
+                yield (
+                    line,
+                    {
+                        **{key: value or None for key, value in record.items()},
+                        "tags": [
+                            tag for tag in (record.get("tags") or "").split("|") if tag
+                        ],
+                    },
+                )
+        finally:
+            text.detach()
+
+    @staticmethod
+    async def _render_cover_variants(
+        s3: Any,  # noqa: ANN401
+        file_blob: str,
+        original: bytes,
+        content_type: str,
+    ) -> tuple[list[CoverVariant], str | None]:
+        """Render the resized and re-encoded variants of a cover and upload them.
+
+        Images are processed in the process pool. Covers of more than
+        `Settings.COVER_MAX_PIXELS` pixels, or that Pillow cannot identify, are
+        rejected. Other covers Pillow cannot decode are kept without variants.
+        """
+        formats = covers.supported_formats(Settings.COVER_VARIANT_FORMATS)
+        try:
+            rendered, placeholder = await ProcessPoolContext.run(
+                covers.render_cover,
+                original,
+                Settings.COVER_VARIANT_WIDTHS,
+                formats,
+                Settings.COVER_VARIANT_QUALITY,
+                Settings.COVER_MAX_PIXELS,
+            )
+        except (Image.DecompressionBombError, UnidentifiedImageError):
+            raise InvalidMimeTypeError(
+                expectedMimeType=_COVER_MIME_TYPES,
+                mimeType=content_type,
+            ) from None
+        except (OSError, ValueError):
+            logger.warning("Could not render the variants of %s", file_blob)
+            return [], None
+
+        variants = [
+            CoverVariant(width=width, format=fmt, key=f"{file_blob}/{width}.{fmt}")
+            for width, fmt, _ in rendered
+        ]
+        await asyncio.gather(
+            *(
+                s3.put_object(
+                    Bucket=Settings.AWS_BUCKET_NAME,
+                    Key=variant.key,
+                    Body=body,
+                    ContentType=covers.content_type(variant.format),
+                    CacheControl=_IMMUTABLE,
+                )
+                for variant, (_, _, body) in zip(variants, rendered, strict=True)
+            ),
         )
+        return variants, placeholder
 
     async def update_title(self, title_id: int, update_title: UpdateTitle) -> Title:
         """Update a title."""
@@ -78,7 +458,7 @@ class TitleService:
             raise TitleNameAlreadyExistsError(titleName=title.name)
 
         title = await self.repository.update_title(title, update_title)
-        return Title(**title.model_dump())
+        return (await self._with_cover_urls([Title(**title.model_dump())]))[0]
 
     async def delete_title(self, title_id: int) -> None:
         """Delete a title."""
@@ -101,8 +481,8 @@ class TitleService:
         if not tags:
             raise TagNotFoundError
 
-        title = await self.repository.add_tags(title_, tags)
-        return Title(**title.model_dump())
+        await self.repository.add_tags([title_id], [tag.id for tag in tags])
+        return await self.get_title(title_id)
 
     async def remove_tags(self, title_id: int, params: UpdateTitleTags) -> Title:
         """Remove a tag from a title."""
@@ -116,63 +496,324 @@ class TitleService:
         if not tags:
             raise TagNotFoundError
 
-        title = await self.repository.remove_tags(title_, tags)
-        return Title(**title.model_dump())
+        await self.repository.remove_tags([title_id], [tag.id for tag in tags])
+        return await self.get_title(title_id)
+
+    async def update_titles_tags(
+        self,
+        params: UpdateTitlesTags,
+    ) -> Sequence[TitleTagIds]:
+        """Remove and add tags to many titles."""
+        tags = await self.repository.update_tags(
+            params.titles,
+            add=params.add,
+            remove=params.remove,
+        )
+        return [
+            TitleTagIds(title_id=title_id, tags=tag_ids)
+            for title_id, tag_ids in tags.items()
+        ]
 
     async def get_title_rating(self, title_id: int) -> "Rating":
         """Get the rating for a title."""
         return await self.repository.get_title_rating(title_id)
 
+    async def get_title_ratings(
+        self,
+        params: GetRatings,
+        user_id: int | None,
+    ) -> Sequence["TargetRating"]:
+        """Get the ratings of many titles."""
+        return await self.repository.get_title_ratings(params.ids, user_id)
+
     async def post_title_rating(
         self,
         user_id: int,
         title_id: int,
         params: PostRating,
-    ) -> "CreateRating":
-        """Post a rating for a title."""
+    ) -> PostedRating:
+        """Post a rating for a title, replacing the user's previous rating."""
         input_params = CreateRating(
             user_id=user_id,
             target_id=title_id,
             value=params.value,
         )
-        await self.repository.create_title_rating(input_params)
-        return input_params
+        created = await self.repository.upsert_title_rating(input_params)
+        return PostedRating(**input_params.model_dump(), created=created)
 
     async def remove_title_rating(self, user_id: int, title_id: int) -> None:
         """Remove a rating for a title."""
-        await self.repository.delete_title_rating(user_id, title_id)
+        await self.repository.delete_title_rating(title_id=title_id, user_id=user_id)
 
-    async def post_title_cover(self, title_id: int, file: UploadFile) -> str:
-        """Post a cover for a title."""
+    async def post_title_cover(
+        self,
+        title_id: int,
+        chunks: AsyncIterable[bytes],
+        size: int | None = None,
+    ) -> str:
+        """Post a cover for a title.
+
+        The cover MIME type is sniffed from the first bytes only, and `size` is
+        the announced size, if known, so oversized covers are rejected before
+        being read. The cover is hashed while it is streamed to a temporary
+        object, which is then copied under its content hash, unless a cover
+        with that hash is already stored, and deleted.
+        """
+        too_large = FileTooLargeError(maxSize=Settings.COVER_MAX_SIZE)
+        if size is not None and size > Settings.COVER_MAX_SIZE:
+            raise too_large
 
-        mime_type = file.content_type or self.MIME.from_buffer(await file.read(1024))
+        title = await self.repository.get_title(id=title_id)
 
-        RegexValidator(
-            string=mime_type,
-            regex=r"^image/(jpeg|webp|jpg|png|gif)$",
-            exception=InvalidMimeTypeError(
-                expectedMimeType="jpeg, webp, jpg, png, gif",
-                mimeType=mime_type,
-            ),
+        if not title:
+            raise TitleNotFoundError(titleId=title_id)
+
+        head, chunks = await read_head(chunks, _MIME_SNIFF_SIZE)
+        mime_type = self._validate_mime_type(head)
+
+        digest = hashlib.sha256()
+
+        async def hashed() -> AsyncIterator[bytes]:
+            async for chunk in limit_size(chunks, Settings.COVER_MAX_SIZE, too_large):
+                digest.update(chunk)
+                yield chunk
+
+        bucket = Settings.AWS_BUCKET_NAME
+        incoming = f"{_INCOMING_COVERS}/{uuid.uuid4().hex}"
+        await self.repository.reserve_cover_blob(incoming)
+
+        async with AwsContext.s3_client() as s3:
+            await MultipartUpload(
+                s3,
+                bucket,
+                incoming,
+                content_type=mime_type,
+            ).upload(hashed())
+
+            try:
+                key = _cover_key(digest.hexdigest())
+                await self.repository.reserve_cover_blob(key)
+                blob = await self.repository.get_cover_blob(key)
+
+                if (
+                    blob is None or not blob.ref_count
+                ) and not await self._object_exists(s3, key):
+                    await s3.copy_object(
+                        Bucket=bucket,
+                        Key=key,
+                        CopySource={"Bucket": bucket, "Key": incoming},
+                        ContentType=mime_type,
+                        CacheControl=_IMMUTABLE,
+                        MetadataDirective="REPLACE",
+                    )
+            finally:
+                await s3.delete_object(Bucket=bucket, Key=incoming)
+                await self.repository.forget_cover_blob(incoming)
+
+            await self._save_cover(s3, title, key, content_type=mime_type, blob=blob)
+
+        return (await AwsContext.get_object_urls([key]))[key]
+
+    async def create_cover_upload(
+        self,
+        title_id: int,
+        params: CreateCoverUpload,
+    ) -> CoverUpload:
+        """Create a presigned URL to upload a title cover straight to S3.
+
+        Covers are stored under their SHA-256, so the URL only accepts a `PUT`
+        of content matching that checksum, with the given content type and
+        size. No URL is issued when the cover is already stored. Either way,
+        the upload must then be completed with `complete_cover_upload`.
+        """
+        if not await self.repository.get_title(id=title_id):
+            raise TitleNotFoundError(titleId=title_id)
+
+        key = _cover_key(params.sha256)
+        expires_at = current_datetime() + timedelta(
+            seconds=Settings.COVER_UPLOAD_URL_EXPIRES,
         )
 
-        await file.seek(0)
+        await self.repository.reserve_cover_blob(key)
+
+        async with AwsContext.s3_client() as s3:
+            if await self._object_exists(s3, key):
+                return CoverUpload(key=key, exists=True, expires_at=expires_at)
+
+            checksum = base64.b64encode(bytes.fromhex(params.sha256)).decode()
+            url = await s3.generate_presigned_url(
+                "put_object",
+                Params={
+                    "Bucket": Settings.AWS_BUCKET_NAME,
+                    "Key": key,
+                    "ContentType": params.content_type,
+                    "ContentLength": params.size,
+                    "CacheControl": _IMMUTABLE,
+                    "ChecksumSHA256": checksum,
+                },
+                ExpiresIn=Settings.COVER_UPLOAD_URL_EXPIRES,
+            )
+
+        return CoverUpload(
+            key=key,
+            url=url,
+            headers={
+                "Content-Type": params.content_type,
+                "Content-Length": str(params.size),
+                "Cache-Control": _IMMUTABLE,
+                "x-amz-checksum-sha256": checksum,
+            },
+            expires_at=expires_at,
+        )
 
+    async def complete_cover_upload(
+        self,
+        title_id: int,
+        params: CompleteCoverUpload,
+    ) -> Title:
+        """Validate a cover uploaded with a presigned URL and set it on the title.
+
+        The object size is checked with a `HEAD` and its MIME type is sniffed
+        from a ranged `GET` of its first bytes. Invalid objects no title uses
+        are deleted.
+        """
         title = await self.repository.get_title(id=title_id)
 
         if not title:
             raise TitleNotFoundError(titleId=title_id)
 
-        file_blob = f"covers/{title_id}"
+        if not re.fullmatch(r"covers/[0-9a-f]{64}", params.key):
+            raise InvalidCoverUploadError(coverKey=params.key)
+
+        bucket = Settings.AWS_BUCKET_NAME
+        blob = await self.repository.get_cover_blob(params.key)
+
+        async with AwsContext.s3_client() as s3:
+            try:
+                head = await s3.head_object(Bucket=bucket, Key=params.key)
+            except ClientError:
+                raise InvalidCoverUploadError(coverKey=params.key) from None
+
+            try:
+                if head["ContentLength"] > Settings.COVER_MAX_SIZE:
+                    raise FileTooLargeError(maxSize=Settings.COVER_MAX_SIZE)
+
+                first_bytes = await s3.get_object(
+                    Bucket=bucket,
+                    Key=params.key,
+                    Range=f"bytes=0-{_MIME_SNIFF_SIZE - 1}",
+                )
+                async with first_bytes["Body"] as body:
+                    mime_type = self._validate_mime_type(await body.read())
+            except ApiError:
+                if blob is None or not blob.ref_count:
+                    await s3.delete_object(Bucket=bucket, Key=params.key)
+                raise
+
+            title = await self._save_cover(
+                s3,
+                title,
+                params.key,
+                content_type=mime_type,
+                blob=blob,
+            )
+
+        return (await self._with_cover_urls([Title(**title.model_dump())]))[0]
 
-        async with self.aws_session.client("s3") as s3:  # type: ignore[no-untyped-call]
-            await s3.upload_fileobj(  # type: ignore[no-untyped-call]
-                file,
-                Settings.AWS_BUCKET_NAME,
-                file_blob,
-                ExtraArgs={"ContentType": mime_type},
+    async def collect_cover_blobs(self) -> int:
+        """Delete the covers no title used for `Settings.COVER_GC_GRACE` seconds.
+
+        Returns the number of deleted covers.
+        """
+        blobs = await self.repository.pop_unreferenced_cover_blobs(
+            grace=Settings.COVER_GC_GRACE,
+            limit=Settings.COVER_GC_BATCH,
+            delete_objects=self._delete_cover_objects,
+        )
+        return len(blobs)
+
+    @staticmethod
+    async def _delete_cover_objects(
+        blobs: Sequence[tuple[str, list[dict[str, Any]]]],
+    ) -> None:
+        """Delete the stored objects of covers, variants included."""
+        keys = [
+            key
+            for blob_key, variants in blobs
+            for key in (blob_key, *(variant["key"] for variant in variants))
+        ]
+
+        async with AwsContext.s3_client() as s3:
+            for start in range(0, len(keys), _S3_DELETE_BATCH):
+                await s3.delete_objects(
+                    Bucket=Settings.AWS_BUCKET_NAME,
+                    Delete={
+                        "Objects": [
+                            {"Key": key}
+                            for key in keys[start : start + _S3_DELETE_BATCH]
+                        ],
+                        "Quiet": True,
+                    },
+                )
+
+    def _validate_mime_type(self, head: bytes) -> str:
+        """Sniff the MIME type of a cover from its first bytes."""
+        mime_type = self.MIME.from_buffer(head)
+
+        RegexValidator(
+            string=mime_type,
+            regex=r"^image/(jpeg|webp|jpg|png|gif)$",
+            exception=InvalidMimeTypeError(
+                expectedMimeType=_COVER_MIME_TYPES,
+                mimeType=mime_type,
+            ),
+        )
+        return mime_type
+
+    @staticmethod
+    async def _object_exists(s3: Any, key: str) -> bool:  # noqa: ANN401
+        try:
+            await s3.head_object(Bucket=Settings.AWS_BUCKET_NAME, Key=key)
+        except ClientError:
+            return False
+        return True
+
+    async def _save_cover(
+        self,
+        s3: Any,  # noqa: ANN401
+        title: "TitleTable",
+        key: str,
+        *,
+        content_type: str,
+        blob: "CoverBlobTable | None",
+    ) -> "TitleTable":
+        """Set a stored cover on a title.
+
+        Variants are reused from the cover blob when a title already uses it,
+        and rendered from the stored cover otherwise.
+        """
+        if blob is not None and blob.ref_count:
+            variants = [CoverVariant(**variant) for variant in blob.variants]
+            placeholder = blob.placeholder
+        else:
+            response = await s3.get_object(Bucket=Settings.AWS_BUCKET_NAME, Key=key)
+            async with response["Body"] as body:
+                original = await body.read()
+            variants, placeholder = await self._render_cover_variants(
+                s3,
+                key,
+                original,
+                content_type,
             )
 
-        await self.repository.update_title_cover(title, file_blob)
+        return await self.repository.update_title_cover(
+            title,
+            key,
+            variants,
+            placeholder,
+            content_type=content_type,
+        )
+
 
-        return f"s3://{file_blob}"
+def _cover_key(sha256: str) -> str:
+    return f"covers/{sha256}"
@@ -1,7 +1,17 @@
 from datetime import datetime
-from typing import TYPE_CHECKING
-
-from sqlalchemy import DateTime, ForeignKey, String
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import (
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src._utils import current_datetime
@@ -11,11 +21,25 @@ from src.modules.title.enums import TitleContentTypeEnum
 if TYPE_CHECKING:
     from src.modules.tag.table import TagTable
 
+RATING_BUCKETS = 10
+
 
 class TitleTable(BaseTable):
     """Title model."""
 
     __tablename__ = "db_titles"
+    __table_args__ = (
+        Index("ix_db_titles_name_id", "name", "id"),
+        Index("ix_db_titles_created_at_id", "created_at", "id"),
+        Index("ix_db_titles_updated_at_id", "updated_at", "id"),
+        Index("ix_db_titles_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_db_titles_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True, sort_order=-1)
     created_at: Mapped[datetime] = mapped_column(
@@ -38,7 +62,22 @@ class TitleTable(BaseTable):
     )
     content_type: Mapped[TitleContentTypeEnum] = mapped_column(__type_pos=String(100))
     cover_image: Mapped[str | None] = mapped_column(default=None, nullable=True)
+    cover_variants: Mapped[list[dict[str, Any]]] = mapped_column(
+        __type_pos=JSONB,
+        default=list,
+        server_default="[]",
+    )
+    cover_placeholder: Mapped[str | None] = mapped_column(default=None, nullable=True)
     is_active: Mapped[bool] = mapped_column(default=True)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     tags: Mapped[list["TagTable"]] = relationship(
         "TagTable",
@@ -73,6 +112,9 @@ class TitleTagTable(BaseTable):
 
 class TitleRatingTable(BaseTable):
     __tablename__ = "db_title_ratings"
+    __table_args__ = (
+        Index("ix_db_title_ratings_target_id_rated_at", "target_id", "rated_at"),
+    )
 
     user_id: Mapped[int] = mapped_column(
         __type_pos=ForeignKey("db_users.id", ondelete="CASCADE"),
@@ -83,9 +125,84 @@ class TitleRatingTable(BaseTable):
         primary_key=True,
     )
     value: Mapped[float]
+    rated_at: Mapped[datetime] = mapped_column(
+        __type_pos=DateTime(timezone=True),
+        default=current_datetime,
+        server_default=func.now(),
+    )
 
     def __repr__(self) -> str:
         return (
             f"< TitleRating user_id={self.user_id} "
             f"title_id={self.target_id} value={self.value} >"
         )
+
+
+class TitleRatingSummaryTable(BaseTable):
+    """Title rating aggregates, maintained alongside `db_title_ratings`."""
+
+    __tablename__ = "db_title_rating_summaries"
+    __table_args__ = (Index("ix_db_title_rating_summaries_updated_at", "updated_at"),)
+
+    target_id: Mapped[int] = mapped_column(
+        __type_pos=ForeignKey("db_titles.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    count: Mapped[int] = mapped_column(server_default="0")
+    total: Mapped[float] = mapped_column(server_default="0")
+    buckets: Mapped[list[int]] = mapped_column(
+        __type_pos=ARRAY(Integer),
+        server_default=text(f"array_fill(0, ARRAY[{RATING_BUCKETS}])"),
+    )
+    average: Mapped[float] = mapped_column(
+        Computed("CASE WHEN count > 0 THEN total / count ELSE 0 END", persisted=True),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        __type_pos=DateTime(timezone=True),
+        server_default=func.now(),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"< TitleRatingSummary title_id={self.target_id} "
+            f"count={self.count} average={self.average} >"
+        )
+
+
+class CoverBlobTable(BaseTable):
+    """Stored cover, addressed by the SHA-256 of its content.
+
+    `ref_count` is the number of titles using the cover. Covers no title has
+    used for a while are garbage collected.
+    """
+
+    __tablename__ = "db_cover_blobs"
+    __table_args__ = (
+        Index(
+            "ix_db_cover_blobs_unreferenced",
+            "updated_at",
+            postgresql_where=text("ref_count = 0"),
+        ),
+    )
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        __type_pos=DateTime(timezone=True),
+        default=current_datetime,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        __type_pos=DateTime(timezone=True),
+        default=current_datetime,
+        onupdate=current_datetime,
+    )
+    content_type: Mapped[str | None] = mapped_column(default=None, nullable=True)
+    variants: Mapped[list[dict[str, Any]]] = mapped_column(
+        __type_pos=JSONB,
+        default=list,
+        server_default="[]",
+    )
+    placeholder: Mapped[str | None] = mapped_column(default=None, nullable=True)
+    ref_count: Mapped[int] = mapped_column(default=0, server_default="0")
+
+    def __repr__(self) -> str:
+        return f"< CoverBlob key={self.key} ref_count={self.ref_count} >"
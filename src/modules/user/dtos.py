@@ -9,10 +9,15 @@ class UpdateUser(BaseModel):
     username: str | None = None
 
 
-class User(BaseModel):
-    """Data Transfer Object for exporting a user."""
+class PublicUser(BaseModel):
+    """Data Transfer Object for exporting a user to other users."""
 
     id: int
     created_at: datetime
     username: str
+
+
+class User(PublicUser):
+    """Data Transfer Object for exporting a user."""
+
     email: str
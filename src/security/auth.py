@@ -49,3 +49,16 @@ class AuthSecurity(APIKeyHeader):
     async def __call__(self, request: Request) -> None:
         """Check authorization header."""
         await self._validate(request)
+
+
+class OptionalAuthSecurity(AuthSecurity):
+    """Authorization security scheme that also lets anonymous requests in.
+
+    `request.state.user` is `None` when no token is sent.
+    """
+
+    async def __call__(self, request: Request) -> None:
+        """Check authorization header, if any."""
+        request.state.user = None
+        if request.headers.get(self.model.name):
+            await self._validate(request)
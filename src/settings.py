@@ -19,6 +19,25 @@ class _Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str = "abc"
     AWS_REGION: str = "sa-east-1"
     AWS_BUCKET_NAME: str = "mybucket"
+    AWS_PUBLIC_URL: str | None = None
+    AWS_URL_EXPIRES: int = 3600
+    AWS_CLIENTS: int = 1
+    AWS_MAX_POOL_CONNECTIONS: int = 50
+    AWS_KEEPALIVE_TIMEOUT: float = 12
+    S3_PART_SIZE: int = 8 * 1024 * 1024
+    S3_UPLOAD_CONCURRENCY: int = 4
+
+    COVER_MAX_SIZE: int = 10 * 1024 * 1024
+    COVER_UPLOAD_URL_EXPIRES: int = 900
+    COVER_VARIANT_WIDTHS: list[int] = [160, 320, 640]
+    COVER_VARIANT_FORMATS: list[str] = ["webp", "avif"]
+    COVER_VARIANT_QUALITY: int = 75
+    COVER_MAX_PIXELS: int = 25_000_000
+    COVER_GC_INTERVAL: int = 3600
+    COVER_GC_GRACE: int = 86400
+    COVER_GC_BATCH: int = 500
+
+    PROCESS_POOL_WORKERS: int = 2
 
     JWT_SECRET: str = "secret"
 
@@ -40,5 +59,25 @@ class _Settings(BaseSettings):
 
     DB_DROP_TABLES: bool = False
 
+    HTTP_CACHE_MAX_AGE: int = 60
+
+    CACHE_BACKEND: Literal["memory", "redis"] = "memory"
+    CACHE_URL: str = "redis://localhost:6379/0"
+    CACHE_TTL: int = 300
+    CACHE_MAX_ENTRIES: int = 10_000
+
+    TITLE_INDEX_MAX_CANDIDATES: int = 50_000
+    TITLE_INDEX_REFRESH_INTERVAL: int = 30
+    TITLE_FACETS_MAX_TITLES: int = 10_000
+    RATING_RECONCILE_INTERVAL: int = 3600
+    TAG_USAGE_RECONCILE_INTERVAL: int = 3600
+    TAG_USAGE_REFRESH_INTERVAL: int = 60
+    GROUP_COUNTS_RECONCILE_INTERVAL: int = 3600
+    GROUP_COUNTS_RECONCILE_BATCH: int = 1000
+    TITLE_RANKING_REFRESH_INTERVAL: int = 60
+    TITLE_RANKING_REBUILD_INTERVAL: int = 3600
+    TITLE_TOP_PRIOR_WEIGHT: float = 10
+    TITLE_TRENDING_HALF_LIFE: int = 2 * 24 * 3600
+
 
 Settings = _Settings()  # type: ignore[call-arg]